@@ -24,6 +24,20 @@ module.exports = {
       autorestart: true,
       watch: false,
       max_memory_restart: "1G"
+    },
+    {
+      name: "resume-parser",
+      script: "python/resume_parser_server.py",
+      interpreter: "python3",
+      args: "--engine transformer",
+      cwd: "/home/ubuntu/talnurt2.0",
+      env: {
+        RESUME_PARSER_HOST: "127.0.0.1",
+        RESUME_PARSER_PORT: 8765
+      },
+      instances: 1,
+      autorestart: true,
+      watch: false
     }
   ]
 };
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Sliding-window NER over the full resume text.
+
+The HF token-classification pipeline only looks at the first 512 tokens of its
+input, so organizations and locations further down a long resume were dropped.
+run_chunked_ner() splits the text into overlapping token windows, runs all
+windows through the pipeline as one batch and maps the entities back to
+character offsets in the original text.
+
+Each window owns a "core" span that ends halfway into the overlap with the next
+window. An entity is kept only by the window whose core contains its start, so
+anything starting near a boundary is seen with half an overlap of context on
+either side. Fragments that still overlap or touch across a boundary are merged
+and duplicates are dropped.
+"""
+import sys
+from typing import Dict, List, Any, Tuple
+
+# Window size in tokens, leaving room for [CLS]/[SEP] under the 512 limit
+NER_WINDOW_TOKENS = 384
+# Tokens shared by consecutive windows
+NER_WINDOW_OVERLAP = 64
+# Windows per forward pass
+NER_BATCH_SIZE = 8
+
+def split_windows(text: str, tokenizer, window_tokens: int = NER_WINDOW_TOKENS,
+                  overlap: int = NER_WINDOW_OVERLAP) -> List[Tuple[int, int, int, int]]:
+    """Split text into overlapping token windows.
+
+    Returns (char_start, char_end, core_start, core_end) per window; the core
+    spans tile the text without gaps or overlap.
+    """
+    offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+    if len(offsets) <= window_tokens:
+        return [(0, len(text), 0, len(text))]
+
+    overlap = min(overlap, window_tokens // 2)
+    step = window_tokens - overlap
+    token_starts = [0]
+    while token_starts[-1] + window_tokens < len(offsets):
+        token_starts.append(token_starts[-1] + step)
+
+    windows = []
+    core_start = 0
+    for i, first in enumerate(token_starts):
+        last = min(first + window_tokens, len(offsets)) - 1
+        if i + 1 < len(token_starts):
+            # Hand over to the next window halfway through the shared tokens
+            core_end = offsets[token_starts[i + 1] + overlap // 2][0]
+        else:
+            core_end = len(text)
+        windows.append((offsets[first][0], offsets[last][1], core_start, core_end))
+        core_start = core_end
+    return windows
+
+def merge_entities(text: str, entities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge entities that overlap or touch across window boundaries and drop duplicates."""
+    merged = []
+    for entity in sorted(entities, key=lambda e: (e["start"], -e["end"])):
+        previous = merged[-1] if merged else None
+        if previous is not None and entity["start"] <= previous["end"]:
+            if entity["entity_group"] == previous["entity_group"]:
+                # Same entity seen from two windows, or split by a boundary
+                previous["end"] = max(previous["end"], entity["end"])
+                previous["word"] = text[previous["start"]:previous["end"]].strip()
+                previous["score"] = max(previous["score"], entity["score"])
+                continue
+            if entity["start"] < previous["end"]:
+                # Conflicting labels for the same span: keep the more confident one
+                if entity["score"] > previous["score"]:
+                    merged[-1] = dict(entity)
+                continue
+        merged.append(dict(entity))
+    return merged
+
+def run_chunked_ner(ner_pipeline, text: str, window_tokens: int = NER_WINDOW_TOKENS,
+                    overlap: int = NER_WINDOW_OVERLAP, batch_size: int = NER_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Run the NER pipeline over the whole text using batched overlapping windows."""
+    tokenizer = getattr(ner_pipeline, "tokenizer", None)
+    # Offsets need a fast tokenizer; otherwise keep the old single-pass behaviour
+    if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+        return ner_pipeline(text)
+
+    windows = split_windows(text, tokenizer, window_tokens, overlap)
+    if len(windows) == 1:
+        return ner_pipeline(text)
+
+    print(f"Running NER over {len(windows)} overlapping windows", file=sys.stderr)
+    window_results = ner_pipeline([text[start:end] for start, end, _, _ in windows], batch_size=batch_size)
+
+    entities = []
+    for (start, _, core_start, core_end), results in zip(windows, window_results):
+        for entity in results:
+            if entity.get("start") is None:
+                continue
+            entity = dict(entity, start=entity["start"] + start, end=entity["end"] + start)
+            if core_start <= entity["start"] < core_end:
+                entities.append(entity)
+    return merge_entities(text, entities)
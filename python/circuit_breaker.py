@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Circuit breaker for the LLM backend.
+
+During a provider outage every resume used to go through the whole retry loop
+(timeouts plus backoff sleeps) before falling back. The breaker counts
+consecutive failed API attempts, meaning network errors and 5xx answers. A 429
+(handled by backing off) or another 4xx answer leaves the state unchanged:
+
+- closed: requests go through; RESUME_PARSER_BREAKER_FAILURES failures in a
+  row (default 5) open it;
+- open: requests go straight to the fallback for
+  RESUME_PARSER_BREAKER_RESET_SECONDS (default 60);
+- half-open: after that, one probe request is let through; success closes the
+  breaker, failure opens it for another period.
+
+One breaker is shared by all threads of a process. Because the parser CLI runs
+once per resume, the state is also kept in a small JSON file
+(RESUME_PARSER_BREAKER_STATE, default parse_cache/llm_breaker.json; set it to
+an empty string to keep the state in memory only) so consecutive CLI runs and
+other processes see the same circuit. RESUME_PARSER_BREAKER=0 disables it.
+
+Usage (inspect or reset the persisted state):
+    python circuit_breaker.py [--reset]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from typing import Dict, Any, Optional
+
+BREAKER_ENABLED = os.environ.get("RESUME_PARSER_BREAKER", "1").lower() not in ("0", "false", "no")
+BREAKER_FAILURES = int(os.environ.get("RESUME_PARSER_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("RESUME_PARSER_BREAKER_RESET_SECONDS", "60"))
+BREAKER_STATE_PATH = os.environ.get(
+    "RESUME_PARSER_BREAKER_STATE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "parse_cache", "llm_breaker.json")
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker, optionally persisted to a JSON state file."""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURES, reset_seconds: float = BREAKER_RESET_SECONDS,
+                 state_path: Optional[str] = BREAKER_STATE_PATH, enabled: bool = BREAKER_ENABLED):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state_path = state_path or None
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.state = {"state": CLOSED, "failures": 0, "opened_at": 0.0, "probe_started_at": 0.0}
+
+    def _load(self):
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.state.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Could not read breaker state: {str(e)}", file=sys.stderr)
+
+    def _save(self):
+        if not self.state_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            # Write and rename so readers in other processes never see a partial file
+            temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            print(f"Could not write breaker state: {str(e)}", file=sys.stderr)
+
+    def allow_request(self) -> bool:
+        """Whether an API call may be attempted now."""
+        if not self.enabled:
+            return True
+        with self.lock:
+            self._load()
+            now = time.time()
+            if self.state["state"] == CLOSED:
+                return True
+            if self.state["state"] == OPEN and now - self.state["opened_at"] < self.reset_seconds:
+                return False
+            # Half-open: one probe at a time; a probe that never reported back is replaced after a period
+            if self.state["state"] == HALF_OPEN and now - self.state["probe_started_at"] < self.reset_seconds:
+                return False
+            self.state["state"] = HALF_OPEN
+            self.state["probe_started_at"] = now
+            self._save()
+            print("LLM circuit half-open, probing the API", file=sys.stderr)
+            return True
+
+    def record_success(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            self._load()
+            if self.state["state"] != CLOSED or self.state["failures"]:
+                if self.state["state"] != CLOSED:
+                    print("LLM circuit closed, the API is answering again", file=sys.stderr)
+                self.state.update({"state": CLOSED, "failures": 0, "opened_at": 0.0, "probe_started_at": 0.0})
+                self._save()
+
+    def record_failure(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            self._load()
+            self.state["failures"] += 1
+            if self.state["state"] == HALF_OPEN or self.state["failures"] >= self.failure_threshold:
+                if self.state["state"] != OPEN:
+                    print(f"LLM circuit open after {self.state['failures']} consecutive failures, "
+                          f"using the fallback for {self.reset_seconds:g} seconds", file=sys.stderr)
+                self.state.update({"state": OPEN, "opened_at": time.time(), "probe_started_at": 0.0})
+            self._save()
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            self._load()
+            status = dict(self.state)
+        status.update({"enabled": self.enabled, "failure_threshold": self.failure_threshold,
+                       "reset_seconds": self.reset_seconds, "state_path": self.state_path})
+        return status
+
+    def reset(self):
+        with self.lock:
+            self.state = {"state": CLOSED, "failures": 0, "opened_at": 0.0, "probe_started_at": 0.0}
+            self._save()
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Inspect or reset the LLM circuit breaker")
+    arg_parser.add_argument("--reset", action="store_true", help="Close the circuit and clear the failure count")
+    args = arg_parser.parse_args()
+
+    breaker = CircuitBreaker()
+    if args.reset:
+        breaker.reset()
+        print(f"Reset {breaker.state_path}", file=sys.stderr)
+    print(json.dumps(breaker.status(), indent=2))
@@ -3,20 +3,57 @@ import json
 import re
 import os
 import requests
-from PyPDF2 import PdfReader
+from requests.adapters import HTTPAdapter
 import traceback
+import threading
+import select
+import signal
 import time  # Import for retry mechanism
+import zipfile
 
-# Try to import docx library for handling Word documents
-try:
-    import docx
-    from docx.oxml.text.paragraph import CT_P
-    from docx.oxml.table import CT_Tbl
-    from docx.text.paragraph import Paragraph
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-    print("Warning: python-docx not installed. DOCX parsing will be limited.", file=sys.stderr)
+from result_cache import cache_key, get_cached, store_cached
+from text_cache import cached_pages
+from pdf_pages import extract_pdf_pages, pdf_extractor_name
+from docx_stream import read_docx_stream
+from llm_stream import stream_chat_completion
+from llm_prompt import slim_resume_text, build_messages
+from circuit_breaker import CircuitBreaker
+
+# Cache identity; bump the version when the prompt or post-processing changes
+PARSER_NAME = "deepseek"
+PARSER_VERSION = "5"
+
+# Characters of cleaned text sent to the API; PDF and DOCX extraction stop once
+# the raw text reaches twice that, since slimming and whitespace cleanup shrink it
+MAX_TEXT_CHARS = 12000
+RAW_TEXT_BUDGET = 2 * MAX_TEXT_CHARS
+
+# Text generate_fallback_json puts in placeholder entries; such results are not cached
+FALLBACK_MARKER = "could not be automatically extracted"
+
+# One keep-alive connection pool per process, reused across resumes and retries
+HTTP_POOL_SIZE = int(os.environ.get("RESUME_PARSER_HTTP_POOL_SIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("RESUME_PARSER_CONNECT_TIMEOUT", "5"))  # seconds
+HTTP_READ_TIMEOUT = float(os.environ.get("RESUME_PARSER_READ_TIMEOUT", "60"))  # seconds
+HTTP_SESSION = None
+HTTP_SESSION_LOCK = threading.Lock()
+
+# Chat completions endpoint and model; point RESUME_PARSER_API_URL at mock_llm_server.py to test offline
+API_URL = os.environ.get("RESUME_PARSER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
+API_MODEL = os.environ.get("RESUME_PARSER_API_MODEL", "deepseek/deepseek-r1:free")
+
+# Shared by all threads; persisted so consecutive CLI runs skip the API during an outage
+LLM_BREAKER = CircuitBreaker()
+
+# Stream completions and parse the JSON as it arrives (RESUME_PARSER_STREAM=0 waits for the full response)
+STREAM_RESPONSES = os.environ.get("RESUME_PARSER_STREAM", "1").lower() not in ("0", "false", "no")
+STREAM_STALL_TIMEOUT = float(os.environ.get("RESUME_PARSER_STREAM_STALL_TIMEOUT", "20"))  # seconds without tokens
+STREAM_FIRST_TOKEN_TIMEOUT = float(os.environ.get("RESUME_PARSER_STREAM_FIRST_TOKEN_TIMEOUT", "60"))  # seconds before the first token
+
+# Seconds to wait for the API before answering with the regex fallback (0 waits for the API, however long)
+HEDGE_BUDGET = float(os.environ.get("RESUME_PARSER_HEDGE_BUDGET", "90"))
+# Hedge children still finishing their API call after the caller got the fallback
+HEDGE_CHILDREN = set()
 
 # Sample structure of the desired output JSON
 SAMPLE_OUTPUT_STRUCTURE = """
@@ -53,91 +90,34 @@ SAMPLE_OUTPUT_STRUCTURE = """
 """
 
 def extract_pdf_text(pdf_path):
-    """Extract text from PDF file"""
+    """Extract text from PDF file with the fastest usable backend, reusing cached pages for a file seen before"""
     try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            reader = PdfReader(file)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        if not text.strip():
-            print(f"Warning: Extracted PDF text is empty or contains only whitespace", file=sys.stderr)
-            # Try alternate method if the primary method returns empty text
-            return extract_pdf_text_fallback(pdf_path)
-        return text
+        pages = cached_pages(pdf_path, pdf_extractor_name(),
+                             lambda path: extract_pdf_pages(path, max_chars=RAW_TEXT_BUDGET), RAW_TEXT_BUDGET)
     except Exception as e:
         print(f"Error reading PDF: {e}", file=sys.stderr)
-        print(traceback.format_exc(), file=sys.stderr)
-        # Try fallback method
-        return extract_pdf_text_fallback(pdf_path)
+        return ""
+    return "".join(page_text + "\n" for page_text in pages if page_text)
 
-def extract_pdf_text_fallback(pdf_path):
-    """Fallback method for extracting text from PDF files"""
+def extract_docx_text(docx_path):
+    """Extract text from DOCX file, reusing cached text for a file seen before"""
+    extractor = "docx-stream" if zipfile.is_zipfile(docx_path) else "docx-binary"
     try:
-        print(f"Trying fallback method for PDF: {pdf_path}", file=sys.stderr)
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            reader = PdfReader(file)
-            
-            # Try a different approach with extracting text
-            for page_num in range(len(reader.pages)):
-                page = reader.pages[page_num]
-                
-                # Extract text with different settings
-                # Some PDFs work better with this method
-                page_text = ""
-                try:
-                    # Try standard extraction first
-                    page_text = page.extract_text()
-                except:
-                    # If that fails, try raw extraction
-                    if hasattr(page, '_extract_text'):
-                        page_text = page._extract_text()
-                
-                if page_text:
-                    text += page_text + "\n"
-                    
-        return text
+        pages = cached_pages(docx_path, extractor, lambda path: [read_docx_text(path)], RAW_TEXT_BUDGET)
     except Exception as e:
-        print(f"Fallback PDF extraction failed: {e}", file=sys.stderr)
+        print(f"Error reading DOCX: {e}", file=sys.stderr)
         return ""
+    return pages[0] if pages else ""
 
-def extract_docx_text(docx_path):
-    """Extract text from DOCX file"""
+def read_docx_text(docx_path):
+    """Read the text of a DOCX file, including tables, headers and footers"""
     try:
-        if DOCX_AVAILABLE:
-            print(f"Using python-docx to extract text from {docx_path}", file=sys.stderr)
-            doc = docx.Document(docx_path)
-            
-            # Extract text from paragraphs
-            full_text = []
-            
-            # Get all paragraphs
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    full_text.append(para.text.strip())
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        full_text.append(' | '.join(row_text))
-            
-            # Create well-formatted text with proper spacing
-            text = '\n'.join(full_text)
-            
-            # Clean up excessive whitespace
-            text = re.sub(r'\n\s*\n', '\n\n', text)
-            return text
+        if zipfile.is_zipfile(docx_path):
+            # Stream word/document.xml plus headers and footers instead of building the python-docx model
+            print(f"Streaming text from {docx_path}", file=sys.stderr)
+            return read_docx_stream(docx_path, max_chars=RAW_TEXT_BUDGET)
         else:
-            # Fallback: Try to read with binary mode and decode
+            # Fallback (e.g. legacy .doc): Try to read with binary mode and decode
             print(f"Fallback method for DOCX: reading as binary", file=sys.stderr)
             with open(docx_path, 'rb') as f:
                 content = f.read()
@@ -164,8 +144,11 @@ def extract_docx_text(docx_path):
         print(traceback.format_exc(), file=sys.stderr)
         return ""
 
-def clean_text(text):
+def clean_text(text, slim=True):
     """Clean extracted text by removing special characters and normalizing whitespace"""
+    # Drop boilerplate and repeated headers first, so more real content fits the limit below
+    if slim:
+        text = slim_resume_text(text)
     # Replace multiple newlines with a single newline
     text = re.sub(r'\n+', '\n', text)
     # Normalize whitespace within lines (not removing newlines)
@@ -173,57 +156,42 @@ def clean_text(text):
     # Remove non-printable characters except for newlines
     text = ''.join(c for c in text if c == '\n' or (32 <= ord(c) <= 126))
     # Cut off text if it's extremely long to stay within model context limits
-    max_length = 12000  # Conservative maximum
+    max_length = MAX_TEXT_CHARS  # Conservative maximum
     if len(text) > max_length:
         print(f"Warning: Text too long ({len(text)} chars), truncating to {max_length} chars", file=sys.stderr)
         return text[:max_length]
     return text
 
-def send_to_deepseek_ai(text, max_retries=3):
-    """Send the extracted text to DeepSeek AI via OpenRouter to parse the resume and return JSON"""
-    print("Sending extracted text to DeepSeek AI for parsing", file=sys.stderr)
-    
-    # Use hardcoded OpenRouter API token
-    openrouter_token = "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"
-    
-    print("Using deepseek with openrouter", file=sys.stderr)
-    
-    # Define the prompt for OpenRouter
-    prompt = f"""
-    You are an expert resume parser. Extract key information from the following resume text 
-    and format it according to the EXACT specified JSON structure. Be precise and accurate.
-
-    *** CRITICALLY IMPORTANT: You MUST follow these rules ***
-    1. Output ONLY valid JSON matching the exact structure below - no other text
-    2. The skills section MUST be under the key "skill" (NOT "skills")
-    3. DO NOT add any additional top-level fields that are not in the sample structure
-    4. DO NOT include technical_skills, soft_skills, tools, email, phone, linkedin, or github as top-level fields
-    5. DO NOT duplicate data between nested objects and the top level
-    6. All data for a given type MUST be in its designated field only (e.g., contact info in contact_info object only)
-    7. Follow the EXACT structure shown below - do not deviate or add extra fields
-
-    The output MUST EXACTLY match this structure:
-    {SAMPLE_OUTPUT_STRUCTURE}
+def get_http_session():
+    """Return the shared requests.Session, creating its connection pool on first use"""
+    global HTTP_SESSION
+    with HTTP_SESSION_LOCK:
+        if HTTP_SESSION is None:
+            session = requests.Session()
+            # Retries are handled by send_to_deepseek_ai so 429s get their backoff
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            HTTP_SESSION = session
+        return HTTP_SESSION
 
-    Here is the resume text to parse:
+def build_deepseek_request(text):
+    """Build the OpenRouter URL, headers and payload for parsing the resume text"""
+    # Use hardcoded OpenRouter API token unless one is configured
+    openrouter_token = os.environ.get(
+        "RESUME_PARSER_API_KEY",
+        "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"
+    )
     
-    {text}
+    print(f"Using {API_MODEL} at {API_URL}", file=sys.stderr)
     
-    IMPORTANT INSTRUCTIONS FOR SKILL EXTRACTION:
-    1. Be exhaustive in extracting technical skills, tools, languages, and soft skills
-    2. Categorize skills properly into technical_skills, soft_skills, and tools categories
-    3. Include ALL programming languages, frameworks, platforms, and technologies mentioned
-    4. Look for skill sections, but also extract skills mentioned throughout the entire resume
-    5. For technical roles (DevOps, Cloud, etc.), include relevant cloud platforms, CI/CD tools, containers, etc.
-    6. For Oracle/BI roles, include all Oracle-related technologies and reporting tools
-    7. The skills section is critical - DO NOT leave this section empty or incomplete
-    8. The skills key in the JSON MUST be "skill" (not "skills")
-
-    Format your response ONLY as the exact JSON structure shown above - no explanations, no markdown, just the JSON.
-    """
+    # Static instructions go in the system message so every request shares the same prefix
+    messages, budget = build_messages(text, SAMPLE_OUTPUT_STRUCTURE)
+    print(f"Prompt: ~{budget['prefix_tokens']} prefix + ~{budget['resume_tokens']} resume tokens, "
+          f"max_tokens {budget['max_tokens']}", file=sys.stderr)
     
     # OpenRouter API endpoint
-    url = "https://openrouter.ai/api/v1/chat/completions"
+    url = API_URL
     
     # Request headers
     headers = {
@@ -234,99 +202,49 @@ def send_to_deepseek_ai(text, max_retries=3):
     
     # Request payload
     payload = {
-        "model": "deepseek/deepseek-r1:free",
-        "messages": [
-            {"role": "system", "content": "You are an expert resume parser that extracts structured information into JSON."},
-            {"role": "user", "content": prompt}
-        ],
+        "model": API_MODEL,
+        "messages": messages,
         "temperature": 0.1,
-        "max_tokens": 3000
+        "max_tokens": budget["max_tokens"]
     }
     
+    return url, headers, payload
+
+def send_to_deepseek_ai(text, max_retries=3):
+    """Send the extracted text to DeepSeek AI via OpenRouter to parse the resume and return JSON"""
+    print("Sending extracted text to DeepSeek AI for parsing", file=sys.stderr)
+    
+    url, headers, payload = build_deepseek_request(text)
+    
     # Initialize variables for retry logic
     retry_count = 0
     wait_time = 2  # Start with 2 seconds wait
     
     while retry_count < max_retries:
+        # Another request may have found the API down while this one was waiting to retry
+        if not LLM_BREAKER.allow_request():
+            print("LLM circuit open, using fallback method without calling the API", file=sys.stderr)
+            return flag_fallback(generate_fallback_json(text), "AI service unavailable (circuit open)")
         try:
-            # Send request to the API
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
+            # Send request to the API over the pooled keep-alive connection
+            if STREAM_RESPONSES:
+                response, data = stream_deepseek_response(url, headers, payload)
+            else:
+                response = get_http_session().post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+                )
+                data = response.json() if response.status_code == 200 else None
             
             if response.status_code == 200:
-                data = response.json()
-                
-                # Debug logging
-                print("\n--- DEBUG: API Response Status ---", file=sys.stderr)
-                print(f"Status code: {response.status_code}", file=sys.stderr)
-                
-                if 'choices' in data and len(data['choices']) > 0 and 'message' in data['choices'][0]:
-                    ai_response = data["choices"][0]["message"]["content"].strip()
-                    
-                    # Debugging: Print the first 100 characters of the response
-                    print(f"Response excerpt: '{ai_response[:100]}...'", file=sys.stderr)
-                    
-                    # If the response is empty, try another model
-                    if not ai_response:
-                        print("Received empty response from DeepSeek. Trying fallback method.", file=sys.stderr)
-                        return generate_fallback_json(text)
-                    
-                    # Extract JSON from the AI response
-                    json_match = re.search(r'```json\s*([\s\S]*?)\s*```', ai_response)
-                    if json_match:
-                        json_text = json_match.group(1).strip()
-                        print(f"Found JSON in code block: {json_text[:50]}...", file=sys.stderr)
-                    else:
-                        # If no code blocks, try to extract JSON directly
-                        # First check if the response starts with a curly brace
-                        if ai_response.startswith('{') and '}' in ai_response:
-                            json_text = ai_response
-                            print("Response appears to be direct JSON", file=sys.stderr)
-                        else:
-                            # Look for JSON-like structure in response
-                            json_match = re.search(r'({[\s\S]*})', ai_response)
-                            if json_match:
-                                json_text = json_match.group(1).strip()
-                                print(f"Extracted JSON using regex: {json_text[:50]}...", file=sys.stderr)
-                            else:
-                                print("Error: Could not extract JSON from response", file=sys.stderr)
-                                print(f"Raw response: '{ai_response}'", file=sys.stderr)
-                                # Try to validate if the entire response is valid JSON
-                                try:
-                                    json.loads(ai_response)
-                                    json_text = ai_response
-                                    print("The entire response seems to be valid JSON", file=sys.stderr)
-                                except:
-                                    print("Falling back to generate basic JSON from text", file=sys.stderr)
-                                    return generate_fallback_json(text)
-                    
-                    # Try to validate the JSON before returning
-                    try:
-                        parsed_json = json.loads(json_text)
-                        print(f"Successfully validated JSON with {len(json_text)} characters", file=sys.stderr)
-                        return json_text
-                    except json.JSONDecodeError as e:
-                        print(f"Error: Invalid JSON: {e}", file=sys.stderr)
-                        print(f"JSON text: '{json_text}'", file=sys.stderr)
-                        # Try to clean the JSON string
-                        cleaned_json = clean_json_string(json_text)
-                        try:
-                            json.loads(cleaned_json)
-                            print("Successfully cleaned and validated JSON", file=sys.stderr)
-                            return cleaned_json
-                        except json.JSONDecodeError:
-                            # Try to repair truncated JSON
-                            repaired_json = repair_truncated_json(json_text)
-                            try:
-                                json.loads(repaired_json)
-                                print("Successfully repaired truncated JSON response", file=sys.stderr)
-                                return repaired_json
-                            except json.JSONDecodeError:
-                                print("Could not repair JSON. Using fallback method.", file=sys.stderr)
-                                return generate_fallback_json(text)
-                else:
-                    print(f"Error: Unexpected API response format: {data}", file=sys.stderr)
-                    return generate_fallback_json(text)
-            elif response.status_code == 429:  # Rate limit error
+                LLM_BREAKER.record_success()
+                return json_from_ai_response(data, text)
+            # Only server errors mean an outage; rate limits and request errors leave the breaker alone
+            if response.status_code >= 500:
+                LLM_BREAKER.record_failure()
+            if response.status_code == 429:  # Rate limit error
                 retry_count += 1
                 print(f"Rate limit error. Retrying in {wait_time} seconds (attempt {retry_count}/{max_retries})", file=sys.stderr)
                 time.sleep(wait_time)
@@ -344,6 +262,7 @@ def send_to_deepseek_ai(text, max_retries=3):
                     return generate_fallback_json(text)
         except requests.exceptions.RequestException as e:
             print(f"Network error: {e}", file=sys.stderr)
+            LLM_BREAKER.record_failure()
             retry_count += 1
             if retry_count < max_retries:
                 print(f"Retrying in {wait_time} seconds (attempt {retry_count}/{max_retries})", file=sys.stderr)
@@ -357,6 +276,110 @@ def send_to_deepseek_ai(text, max_retries=3):
     print("All API attempts failed. Using fallback method.", file=sys.stderr)
     return generate_fallback_json(text)
 
+def stream_deepseek_response(url, headers, payload):
+    """Stream the completion, logging progress and fields as they complete.
+    
+    Returns the HTTP response and, on success, the streamed content in the shape
+    of a non-streamed chat completion so json_from_ai_response can handle it.
+    """
+    started_at = time.time()
+    
+    def on_field(key, value):
+        print(f"Field ready after {time.time() - started_at:.1f}s: {key}", file=sys.stderr)
+    
+    def on_progress(chars, fields):
+        print(f"Streaming: {chars} characters, {len(fields)} fields complete", file=sys.stderr)
+    
+    result = stream_chat_completion(
+        get_http_session(), url, headers, payload,
+        HTTP_CONNECT_TIMEOUT, STREAM_STALL_TIMEOUT, STREAM_FIRST_TOKEN_TIMEOUT,
+        on_field=on_field, on_progress=on_progress
+    )
+    response = result["response"]
+    if response.status_code != 200:
+        return response, None
+    
+    if result["stalled"]:
+        print(f"Stream stalled after {len(result['content'])} characters, stopping early", file=sys.stderr)
+    if result["truncated"]:
+        print(f"Stream truncated (finish_reason={result['finish_reason']}), repairing partial JSON", file=sys.stderr)
+    # Prefer the object itself so an unclosed code fence doesn't hide a truncated tail
+    content = result["json"] or result["content"]
+    return response, {"choices": [{"message": {"content": content}}]}
+
+def json_from_ai_response(data, text):
+    """Extract and validate the JSON from a chat completion response, falling back to regex extraction"""
+    # Debug logging
+    print("\n--- DEBUG: API Response Status ---", file=sys.stderr)
+    
+    if 'choices' in data and len(data['choices']) > 0 and 'message' in data['choices'][0]:
+        ai_response = data["choices"][0]["message"]["content"].strip()
+        
+        # Debugging: Print the first 100 characters of the response
+        print(f"Response excerpt: '{ai_response[:100]}...'", file=sys.stderr)
+        
+        # If the response is empty, try another model
+        if not ai_response:
+            print("Received empty response from DeepSeek. Trying fallback method.", file=sys.stderr)
+            return generate_fallback_json(text)
+        
+        # Extract JSON from the AI response
+        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', ai_response)
+        if json_match:
+            json_text = json_match.group(1).strip()
+            print(f"Found JSON in code block: {json_text[:50]}...", file=sys.stderr)
+        else:
+            # If no code blocks, try to extract JSON directly
+            # First check if the response starts with a curly brace
+            if ai_response.startswith('{') and '}' in ai_response:
+                json_text = ai_response
+                print("Response appears to be direct JSON", file=sys.stderr)
+            else:
+                # Look for JSON-like structure in response
+                json_match = re.search(r'({[\s\S]*})', ai_response)
+                if json_match:
+                    json_text = json_match.group(1).strip()
+                    print(f"Extracted JSON using regex: {json_text[:50]}...", file=sys.stderr)
+                else:
+                    print("Error: Could not extract JSON from response", file=sys.stderr)
+                    print(f"Raw response: '{ai_response}'", file=sys.stderr)
+                    # Try to validate if the entire response is valid JSON
+                    try:
+                        json.loads(ai_response)
+                        json_text = ai_response
+                        print("The entire response seems to be valid JSON", file=sys.stderr)
+                    except:
+                        print("Falling back to generate basic JSON from text", file=sys.stderr)
+                        return generate_fallback_json(text)
+        
+        # Try to validate the JSON before returning
+        try:
+            parsed_json = json.loads(json_text)
+            print(f"Successfully validated JSON with {len(json_text)} characters", file=sys.stderr)
+            return json_text
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON: {e}", file=sys.stderr)
+            print(f"JSON text: '{json_text}'", file=sys.stderr)
+            # Try to clean the JSON string
+            cleaned_json = clean_json_string(json_text)
+            try:
+                json.loads(cleaned_json)
+                print("Successfully cleaned and validated JSON", file=sys.stderr)
+                return cleaned_json
+            except json.JSONDecodeError:
+                # Try to repair truncated JSON
+                repaired_json = repair_truncated_json(json_text)
+                try:
+                    json.loads(repaired_json)
+                    print("Successfully repaired truncated JSON response", file=sys.stderr)
+                    return repaired_json
+                except json.JSONDecodeError:
+                    print("Could not repair JSON. Using fallback method.", file=sys.stderr)
+                    return generate_fallback_json(text)
+    else:
+        print(f"Error: Unexpected API response format: {data}", file=sys.stderr)
+        return generate_fallback_json(text)
+
 def clean_json_string(json_str):
     """Clean and repair malformed JSON strings"""
     # Remove any leading/trailing whitespace
@@ -630,6 +653,163 @@ def process_resume(file_path):
         print(f"Error: File {file_path} does not exist", file=sys.stderr)
         return json.dumps({"error": "File not found"})
     
+    # Same file parsed before: return the stored result without calling the API
+    key = cache_key(file_path, PARSER_NAME, PARSER_VERSION)
+    cached = get_cached(key)
+    if cached is not None:
+        print("Returning cached parse result", file=sys.stderr)
+        return cached
+    
+    text = read_resume_file(file_path)
+    
+    if not text:
+        print(f"Error: Could not extract text from {file_path}", file=sys.stderr)
+        return json.dumps({"error": "Failed to extract text from resume"})
+    
+    # Clean text
+    cleaned_text = clean_text(text)
+    print(f"Extracted {len(cleaned_text)} characters of text", file=sys.stderr)
+    
+    # Print sample for debugging
+    print("\n--- Sample of Extracted Text ---", file=sys.stderr)
+    print(cleaned_text[:500] + "..." if len(cleaned_text) > 500 else cleaned_text, file=sys.stderr)
+    print("--- End Sample Text ---\n", file=sys.stderr)
+    
+    # Send text to DeepSeek AI for parsing
+    if HEDGE_BUDGET > 0:
+        # The API side caches its own answer, including one that arrives after the budget
+        json_text = hedged_parse(key, cleaned_text)
+    else:
+        json_text = send_to_deepseek_ai(cleaned_text)
+        if json_text:
+            validate_and_cache(key, json_text)
+    
+    # If AI parsing failed, return error
+    if not json_text:
+        return json.dumps({"error": "Failed to parse resume with AI"})
+    
+    # Return the JSON directly
+    return json_text
+
+def hedged_parse(key, text, budget=HEDGE_BUDGET):
+    """Race the API call against the regex fallback, answering with the fallback once the budget runs out.
+    
+    The API call runs in a child process (a thread where fork is unavailable) and
+    caches its answer whenever it arrives, so a late answer serves the next request.
+    """
+    deadline = time.monotonic() + budget
+    if not hasattr(os, "fork"):
+        return _hedged_parse_thread(key, text, budget, deadline)
+    _reap_hedge_children()
+    
+    read_fd, write_fd = os.pipe()
+    # Don't let buffered output be written twice by the child
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        signal.signal(signal.SIGUSR1, _detach_from_caller)
+        exit_code = 0
+        try:
+            json_text = send_to_deepseek_ai(text)
+            validate_and_cache(key, json_text)
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(json_text.encode('utf-8'))
+        except BrokenPipeError:
+            pass  # The caller already answered with the fallback
+        except Exception as e:
+            print(f"Error in API call: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    
+    os.close(write_fd)
+    # Computed while the API call is in flight
+    fallback = generate_fallback_json(text)
+    chunks = []
+    finished = False
+    try:
+        while not finished:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                break
+            chunk = os.read(read_fd, 65536)
+            chunks.append(chunk)
+            finished = not chunk
+    finally:
+        os.close(read_fd)
+    
+    if finished:
+        os.waitpid(pid, 0)
+        json_text = b"".join(chunks).decode('utf-8')
+        return flag_api_fallback(json_text or fallback)
+    
+    # Let the child finish and cache the answer without holding our caller's pipes open
+    os.kill(pid, signal.SIGUSR1)
+    # Reaped without blocking here or by a later hedged_parse, so a long-running service collects no zombies
+    HEDGE_CHILDREN.add(pid)
+    _reap_hedge_children()
+    print(f"No API answer within {budget:g} seconds, returning the fallback result", file=sys.stderr)
+    return flag_fallback(fallback, f"AI parsing did not finish within {budget:g} seconds")
+
+def _hedged_parse_thread(key, text, budget, deadline):
+    outcome = {}
+    
+    def call_api():
+        try:
+            outcome["json"] = send_to_deepseek_ai(text)
+            validate_and_cache(key, outcome["json"])
+        except Exception as e:
+            print(f"Error in API call: {e}", file=sys.stderr)
+    
+    # A daemon thread: a late answer is only cached if this process keeps running
+    worker = threading.Thread(target=call_api, name="deepseek-hedge", daemon=True)
+    worker.start()
+    fallback = generate_fallback_json(text)
+    worker.join(max(0.0, deadline - time.monotonic()))
+    if not worker.is_alive():
+        return flag_api_fallback(outcome.get("json") or fallback)
+    print(f"No API answer within {budget:g} seconds, returning the fallback result", file=sys.stderr)
+    return flag_fallback(fallback, f"AI parsing did not finish within {budget:g} seconds")
+
+def _reap_hedge_children():
+    """Collect hedge children that have exited since the last call, without waiting for the others"""
+    for pid in list(HEDGE_CHILDREN):
+        try:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            done = pid  # Already reaped elsewhere
+        if done:
+            HEDGE_CHILDREN.discard(pid)
+
+def _detach_from_caller(signum, frame):
+    """Point stdio at /dev/null so the caller sees our output end while the API call finishes"""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+
+def flag_fallback(json_text, reason):
+    """Mark a regex fallback result so callers can tell it from an API parse"""
+    result = json.loads(json_text)
+    result["fallback"] = True
+    result["fallback_reason"] = reason
+    return json.dumps(result, indent=2)
+
+def flag_api_fallback(json_text):
+    """Flag a regex fallback that send_to_deepseek_ai returned after the API failed, unless already flagged"""
+    if FALLBACK_MARKER not in json_text:
+        return json_text
+    try:
+        if json.loads(json_text).get("fallback"):
+            return json_text
+    except (json.JSONDecodeError, AttributeError):
+        return json_text
+    return flag_fallback(json_text, "AI parsing failed, used regex extraction")
+
+def read_resume_file(file_path):
+    """Extract the text of a resume file based on its type"""
     # Get file extension to handle different file types
     _, file_ext = os.path.splitext(file_path.lower())
     
@@ -652,38 +832,19 @@ def process_resume(file_path):
             except Exception as e:
                 print(f"Error reading file {file_path}: {e}", file=sys.stderr)
                 text = ""
-    
-    if not text:
-        print(f"Error: Could not extract text from {file_path}", file=sys.stderr)
-        return json.dumps({"error": "Failed to extract text from resume"})
-    
-    # Clean text
-    cleaned_text = clean_text(text)
-    print(f"Extracted {len(cleaned_text)} characters of text", file=sys.stderr)
-    
-    # Print sample for debugging
-    print("\n--- Sample of Extracted Text ---", file=sys.stderr)
-    print(cleaned_text[:500] + "..." if len(cleaned_text) > 500 else cleaned_text, file=sys.stderr)
-    print("--- End Sample Text ---\n", file=sys.stderr)
-    
-    # Send text to DeepSeek AI for parsing
-    json_text = send_to_deepseek_ai(cleaned_text)
-    
-    # If AI parsing failed, return error
-    if not json_text:
-        return json.dumps({"error": "Failed to parse resume with AI"})
-    
-    # Try to validate the JSON before returning
+    return text
+
+def validate_and_cache(key, json_text):
+    """Warn about unexpected AI output and cache results that came from the API"""
     try:
         parsed_json = json.loads(json_text)
         # Make sure it follows the expected structure
         if not isinstance(parsed_json, dict) or "name" not in parsed_json:
             print("Warning: AI returned JSON doesn't match expected structure", file=sys.stderr)
+        elif FALLBACK_MARKER not in json_text:
+            store_cached(key, PARSER_NAME, json_text)
     except json.JSONDecodeError:
         print("Warning: AI returned invalid JSON", file=sys.stderr)
-    
-    # Return the JSON directly
-    return json_text
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Streaming DOCX text extraction straight from the package XML.
+
+python-docx builds the whole document object model, and walking
+table.rows[].cells repeats merged cells (quadratic on heavily merged tables).
+Here word/document.xml is read from the zip with ElementTree.iterparse, and
+each paragraph and table row is emitted as soon as its closing tag is seen,
+in document order, then dropped from memory:
+
+- paragraphs become one block each (empty paragraphs become blank lines);
+- table rows become "cell | cell | ..." blocks, with every <w:tc> read once,
+  so merged cells are not repeated; nested tables are folded into their cell;
+- text boxes become blocks of their own, and the duplicate fallback copy
+  Word stores next to them (mc:Fallback) is skipped;
+- headers and footers, where contact details often live, are read as well:
+  headers before the body, footers after it, each distinct block once.
+
+Usage:
+    python docx_stream.py <resume.docx>
+"""
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Optional, Set
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Run content that stands for a character
+CHARACTER_TAGS = {W + "tab": "\t", W + "br": "\n", W + "cr": "\n", W + "noBreakHyphen": "-"}
+
+def _part_number(name: str) -> int:
+    match = re.search(r'(\d+)\.xml$', name)
+    return int(match.group(1)) if match else 0
+
+def iter_part_blocks(xml_file) -> Iterator[str]:
+    """Paragraph and table row texts of one WordprocessingML part, in document order."""
+    paragraphs: List[List[str]] = []  # text of the open paragraphs (text boxes nest them)
+    rows: List[List[str]] = []  # cell texts of the open table rows
+    cells: List[List[str]] = []  # paragraph texts of the open cells
+    skip_depth = 0  # inside an mc:Fallback copy
+
+    for event, element in ET.iterparse(xml_file, events=("start", "end")):
+        tag = element.tag
+        if tag == MC_FALLBACK:
+            skip_depth += 1 if event == "start" else -1
+            if event == "end":
+                element.clear()
+            continue
+        if skip_depth:
+            continue
+
+        if event == "start":
+            if tag == W + "p":
+                paragraphs.append([])
+            elif tag == W + "tr":
+                rows.append([])
+            elif tag == W + "tc":
+                cells.append([])
+            continue
+
+        if tag == W + "t" and paragraphs:
+            paragraphs[-1].append(element.text or "")
+        elif tag in CHARACTER_TAGS and paragraphs:
+            paragraphs[-1].append(CHARACTER_TAGS[tag])
+        elif tag == W + "p" and paragraphs:
+            text = "".join(paragraphs.pop()).strip()
+            if cells:
+                if text:
+                    cells[-1].append(text)
+            else:
+                yield text
+            element.clear()
+        elif tag == W + "tc" and cells:
+            text = " ".join(cells.pop())
+            if rows:
+                rows[-1].append(text)
+        elif tag == W + "tr" and rows:
+            text = " | ".join(cell for cell in rows.pop() if cell)
+            if cells:
+                # Row of a nested table: part of the enclosing cell
+                if text:
+                    cells[-1].append(text)
+            elif text:
+                yield text
+            element.clear()
+
+def iter_docx_blocks(docx_path: str) -> Iterator[str]:
+    """Text blocks of a DOCX file: headers, then the body, then footers."""
+    with zipfile.ZipFile(docx_path) as package:
+        names = package.namelist()
+        headers = sorted((name for name in names if re.match(r'word/header\d*\.xml$', name)), key=_part_number)
+        footers = sorted((name for name in names if re.match(r'word/footer\d*\.xml$', name)), key=_part_number)
+
+        # First-page, even-page and default headers usually repeat the same lines
+        seen: Set[str] = set()
+        for name in headers:
+            with package.open(name) as xml_file:
+                for block in iter_part_blocks(xml_file):
+                    if block and block not in seen:
+                        seen.add(block)
+                        yield block
+
+        with package.open("word/document.xml") as xml_file:
+            yield from iter_part_blocks(xml_file)
+
+        for name in footers:
+            with package.open(name) as xml_file:
+                for block in iter_part_blocks(xml_file):
+                    if block and block not in seen:
+                        seen.add(block)
+                        yield block
+
+def read_docx_stream(docx_path: str, max_chars: Optional[int] = None) -> str:
+    """Text of a DOCX file, one block per line, stopping after the block that reaches max_chars."""
+    blocks = []
+    total = 0
+    iterator = iter_docx_blocks(docx_path)
+    try:
+        for block in iterator:
+            # Length of the joined text so far, the same measure text_cache uses to spot a truncated extraction
+            total += len(block) + (1 if blocks else 0)
+            blocks.append(block)
+            if max_chars is not None and total >= max_chars:
+                print(f"Text budget of {max_chars} characters reached, skipping the rest of the document", file=sys.stderr)
+                break
+    finally:
+        iterator.close()
+    return "\n".join(blocks)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python docx_stream.py <resume.docx>", file=sys.stderr)
+        sys.exit(1)
+    print(read_docx_stream(sys.argv[1]))
@@ -7,42 +7,121 @@ import traceback
 import time
 import string
 import unicodedata
+import glob
+import argparse
+import gc
+import functools
+import multiprocessing
 from typing import Dict, List, Any, Tuple, Optional, Set
 from datetime import datetime
 
+from inference_deadline import load_with_deadline, deadline_stopping_criteria, save_model_cache
+from chunked_ner import run_chunked_ner
+from section_chunks import split_for_context, merge_section_results
+from result_cache import cache_key, get_cached_result, store_result
+from text_cache import cached_pages
+from pdf_pages import extract_pdf_pages, pdf_extractor_name
+from docx_stream import read_docx_stream
+
 # Global variables to cache models
 NER_PIPELINE = None
 RESUME_MODEL = None
 RESUME_TOKENIZER = None
 MODEL_LOAD_TIMEOUT = 60  # seconds
+INFERENCE_TIMEOUT = 30  # seconds per resume
+# Resumes longer than one BART input are split into chunks of this many tokens
+# and the chunk outputs merged; RESUME_PARSER_MAP_REDUCE=0 truncates instead
+SECTION_CHUNK_TOKENS = 880
+MAP_REDUCE_SECTIONS = os.environ.get("RESUME_PARSER_MAP_REDUCE", "1").lower() not in ("0", "false", "no")
+# PDF and DOCX extraction stop after the page or paragraph that reaches this many characters (about 10 dense pages)
+MAX_TEXT_CHARS = int(os.environ.get("RESUME_PARSER_MAX_TEXT_CHARS", "40000"))
 
 # Import necessary libraries
 try:
-    import torch
     import pdfplumber
     import docx
-    from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
-    import nltk
-    from nltk.tokenize import word_tokenize, sent_tokenize
-    from nltk.corpus import stopwords
 except ImportError:
     print("Installing required packages...", file=sys.stderr)
-    os.system("pip install torch transformers pdfplumber python-docx nltk")
-    import torch
+    os.system("pip install pdfplumber python-docx")
     import pdfplumber
     import docx
-    from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
-    import nltk
+
+# Heavy libraries are imported on first use so the regex-only stages (and
+# --lite parses) never pay for torch, transformers or nltk
+torch = None
+AutoTokenizer = AutoModelForTokenClassification = AutoModelForSeq2SeqLM = pipeline = None
+NLTK_TOOLS = None
+
+# Skip model-backed stages entirely (regex-only "lite" parsing)
+LITE_MODE = os.environ.get("RESUME_PARSER_LITE", "").lower() in ("1", "true", "yes")
+
+def import_model_libraries():
+    """Import torch and transformers on first use, installing them if missing."""
+    global torch, AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
+    if torch is not None:
+        return
+    try:
+        import torch
+        from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
+    except ImportError:
+        print("Installing required packages...", file=sys.stderr)
+        os.system("pip install torch transformers")
+        import torch
+        from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
+
+def load_nltk_tools():
+    """Import nltk on first use and return (word_tokenize, sent_tokenize, stop_words)."""
+    global NLTK_TOOLS
+    if NLTK_TOOLS is not None:
+        return NLTK_TOOLS
+    
+    try:
+        import nltk
+    except ImportError:
+        print("Installing required packages...", file=sys.stderr)
+        os.system("pip install nltk")
+        import nltk
+    
+    # Download necessary NLTK data
+    try:
+        nltk.data.find('tokenizers/punkt')
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('punkt')
+        nltk.download('stopwords')
+    
     from nltk.tokenize import word_tokenize, sent_tokenize
     from nltk.corpus import stopwords
+    NLTK_TOOLS = (word_tokenize, sent_tokenize, set(stopwords.words('english')))
+    return NLTK_TOOLS
 
-# Download necessary NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+# English stopwords for lite parses, which must not import or download nltk
+LITE_STOP_WORDS = {
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours', 'yourself', 'yourselves',
+    'he', 'him', 'his', 'himself', 'she', 'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their',
+    'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are',
+    'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an',
+    'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about',
+    'against', 'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up',
+    'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here', 'there', 'when',
+    'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no',
+    'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will', 'just', 'don',
+    'should', 'now'
+}
+
+def lite_word_tokenize(text: str) -> List[str]:
+    """Words of text, keeping tokens such as c++, c#, node.js and ci/cd whole."""
+    return re.findall(r'\w[\w.+#/-]*[\w+#]|\w', text)
+
+def lite_sent_tokenize(text: str) -> List[str]:
+    """Sentences of text, split at line breaks and sentence-ending punctuation."""
+    return [sentence for sentence in re.split(r'(?<=[.!?])\s+|\n+', text) if sentence.strip()]
+
+def load_text_tools(lite: bool = False):
+    """(word_tokenize, sent_tokenize, stop_words): nltk's, or the built-in ones in lite mode."""
+    if lite:
+        return lite_word_tokenize, lite_sent_tokenize, LITE_STOP_WORDS
+    return load_nltk_tools()
 
 # Define models
 NER_MODEL_NAME = "dslim/bert-base-NER"
@@ -52,31 +131,70 @@ RESUME_PARSER_MODEL_NAME = "ml6team/bart-large-resume-parser"
 LOCAL_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
 os.makedirs(LOCAL_MODEL_DIR, exist_ok=True)
 
+# Use the int8 copies built by quantize_models.py when they exist
+USE_QUANTIZED_MODELS = os.environ.get("RESUME_PARSER_QUANTIZED", "").lower() in ("1", "true", "yes")
+QUANTIZED_MODEL_SUFFIX = "_int8"
+
+# Inference backend: "pytorch" (default) or "onnx" (ONNX Runtime, see onnx_backend.py)
+INFERENCE_BACKEND = os.environ.get("RESUME_PARSER_BACKEND", "pytorch").lower()
+
+# Bump when parsing logic changes so stale cached results are not served
+PARSER_VERSION = "4"
+
+# File types accepted by parse_resume
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+# Generation batches' worth of files considered together when bucketing by length
+GENERATION_BUCKET_WINDOW = 4
+
 def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from a PDF file using pdfplumber."""
-    text = ""
+    """Extract text from a PDF file with the fastest usable backend, reusing cached pages for a file seen before."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                extracted = page.extract_text() or ""
-                text += extracted
-                text += "\n\n"
+        pages = cached_pages(pdf_path, pdf_extractor_name(),
+                             lambda path: extract_pdf_pages(path, max_chars=MAX_TEXT_CHARS), MAX_TEXT_CHARS)
     except Exception as e:
         print(f"Error extracting text from PDF: {str(e)}", file=sys.stderr)
         raise
-    return text
+    return "".join(page + "\n\n" for page in pages)
 
 def extract_text_from_docx(docx_path: str) -> str:
-    """Extract text from a DOCX file."""
-    text = ""
+    """Extract text from a DOCX file, reusing cached text for a file seen before."""
     try:
-        doc = docx.Document(docx_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        pages = cached_pages(docx_path, "docx-stream", read_docx_paragraphs, MAX_TEXT_CHARS)
     except Exception as e:
         print(f"Error extracting text from DOCX: {str(e)}", file=sys.stderr)
         raise
-    return text
+    return pages[0] if pages else ""
+
+def read_docx_paragraphs(docx_path: str) -> List[str]:
+    """Paragraphs, table rows, headers and footers of a DOCX file as a single page (DOCX has no page breaks to keep)."""
+    return [read_docx_stream(docx_path, max_chars=MAX_TEXT_CHARS)]
+
+def _load_ner_weights():
+    """Load the NER tokenizer and model weights from the configured source."""
+    import_model_libraries()
+    # Try to load from local cache if exists
+    local_ner_path = os.path.join(LOCAL_MODEL_DIR, "ner_model")
+    quantized_ner_path = local_ner_path + QUANTIZED_MODEL_SUFFIX
+    if INFERENCE_BACKEND == "onnx":
+        from onnx_backend import load_onnx_model
+        model, tokenizer = load_onnx_model("token-classification", LOCAL_MODEL_DIR)
+    elif USE_QUANTIZED_MODELS and os.path.exists(quantized_ner_path):
+        print(f"Loading int8 NER model from local cache: {quantized_ner_path}", file=sys.stderr)
+        from quantize_models import load_quantized_model
+        tokenizer = AutoTokenizer.from_pretrained(quantized_ner_path)
+        model = load_quantized_model(quantized_ner_path, AutoModelForTokenClassification)
+    elif os.path.exists(local_ner_path):
+        print(f"Loading NER model from local cache: {local_ner_path}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(local_ner_path)
+        model = AutoModelForTokenClassification.from_pretrained(local_ner_path)
+    else:
+        print(f"Loading NER model from HuggingFace: {NER_MODEL_NAME}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_NAME)
+        model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_NAME)
+        # Save to local cache, atomically: the load may be cut off once its deadline has passed
+        save_model_cache(local_ner_path, tokenizer, model)
+    return tokenizer, model
 
 def load_ner_model():
     """Load the NER model for entity extraction with timeout."""
@@ -85,24 +203,8 @@ def load_ner_model():
         return NER_PIPELINE
     
     try:
-        start_time = time.time()
-        # Try to load from local cache if exists
-        local_ner_path = os.path.join(LOCAL_MODEL_DIR, "ner_model")
-        if os.path.exists(local_ner_path):
-            print(f"Loading NER model from local cache: {local_ner_path}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(local_ner_path)
-            model = AutoModelForTokenClassification.from_pretrained(local_ner_path)
-        else:
-            print(f"Loading NER model from HuggingFace: {NER_MODEL_NAME}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_NAME)
-            model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_NAME)
-            # Save to local cache
-            tokenizer.save_pretrained(local_ner_path)
-            model.save_pretrained(local_ner_path)
-        
-        # Check for timeout
-        if time.time() - start_time > MODEL_LOAD_TIMEOUT:
-            raise TimeoutError(f"Loading NER model timed out after {MODEL_LOAD_TIMEOUT} seconds")
+        # Give up waiting once the load overruns; it finishes in the background
+        tokenizer, model = load_with_deadline("NER model", _load_ner_weights, MODEL_LOAD_TIMEOUT)
         
         NER_PIPELINE = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
         return NER_PIPELINE
@@ -113,6 +215,32 @@ def load_ner_model():
         NER_PIPELINE = None
         return None
 
+def _load_bart_weights():
+    """Load the BART tokenizer and model weights from the configured source."""
+    import_model_libraries()
+    # Try to load from local cache if exists
+    local_bart_path = os.path.join(LOCAL_MODEL_DIR, "bart_model")
+    quantized_bart_path = local_bart_path + QUANTIZED_MODEL_SUFFIX
+    if INFERENCE_BACKEND == "onnx":
+        from onnx_backend import load_onnx_model
+        model, tokenizer = load_onnx_model("seq2seq", LOCAL_MODEL_DIR)
+    elif USE_QUANTIZED_MODELS and os.path.exists(quantized_bart_path):
+        print(f"Loading int8 BART model from local cache: {quantized_bart_path}", file=sys.stderr)
+        from quantize_models import load_quantized_model
+        tokenizer = AutoTokenizer.from_pretrained(quantized_bart_path)
+        model = load_quantized_model(quantized_bart_path, AutoModelForSeq2SeqLM)
+    elif os.path.exists(local_bart_path):
+        print(f"Loading BART model from local cache: {local_bart_path}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(local_bart_path)
+        model = AutoModelForSeq2SeqLM.from_pretrained(local_bart_path)
+    else:
+        print(f"Loading BART model from HuggingFace: {RESUME_PARSER_MODEL_NAME}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(RESUME_PARSER_MODEL_NAME)
+        model = AutoModelForSeq2SeqLM.from_pretrained(RESUME_PARSER_MODEL_NAME)
+        # Save to local cache, atomically: the load may be cut off once its deadline has passed
+        save_model_cache(local_bart_path, tokenizer, model)
+    return tokenizer, model
+
 def load_resume_parser_model():
     """Load the BART resume parser model with timeout."""
     global RESUME_MODEL, RESUME_TOKENIZER
@@ -120,24 +248,8 @@ def load_resume_parser_model():
         return RESUME_MODEL, RESUME_TOKENIZER
     
     try:
-        start_time = time.time()
-        # Try to load from local cache if exists
-        local_bart_path = os.path.join(LOCAL_MODEL_DIR, "bart_model")
-        if os.path.exists(local_bart_path):
-            print(f"Loading BART model from local cache: {local_bart_path}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(local_bart_path)
-            model = AutoModelForSeq2SeqLM.from_pretrained(local_bart_path)
-        else:
-            print(f"Loading BART model from HuggingFace: {RESUME_PARSER_MODEL_NAME}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(RESUME_PARSER_MODEL_NAME)
-            model = AutoModelForSeq2SeqLM.from_pretrained(RESUME_PARSER_MODEL_NAME)
-            # Save to local cache
-            tokenizer.save_pretrained(local_bart_path)
-            model.save_pretrained(local_bart_path)
-        
-        # Check for timeout
-        if time.time() - start_time > MODEL_LOAD_TIMEOUT:
-            raise TimeoutError(f"Loading BART model timed out after {MODEL_LOAD_TIMEOUT} seconds")
+        # Give up waiting once the load overruns; it finishes in the background
+        tokenizer, model = load_with_deadline("BART model", _load_bart_weights, MODEL_LOAD_TIMEOUT)
         
         RESUME_MODEL = model
         RESUME_TOKENIZER = tokenizer
@@ -156,16 +268,17 @@ def extract_entities(text: str, ner_pipeline) -> Dict[str, Any]:
         return extract_entities_with_regex(text)
     
     try:
-        results = ner_pipeline(text)
+        # Windowed so entities past the model's 512-token limit are not lost
+        results = run_chunked_ner(ner_pipeline, text)
         
         # Extract person names (assuming the first PER entity is the person's name)
         names = [entity["word"] for entity in results if entity["entity_group"] == "PER"]
         
         # Detect organization names for companies and universities
-        orgs = [entity["word"] for entity in results if entity["entity_group"] == "ORG"]
+        orgs = list(dict.fromkeys(entity["word"] for entity in results if entity["entity_group"] == "ORG"))
         
         # Detect locations
-        locations = [entity["word"] for entity in results if entity["entity_group"] == "LOC"]
+        locations = list(dict.fromkeys(entity["word"] for entity in results if entity["entity_group"] == "LOC"))
         
         # If NER model didn't find any names, try regex fallback
         if not names:
@@ -498,8 +611,8 @@ def parse_experience(experience_text: str) -> List[Dict[str, str]]:
     
     return experience_entries
 
-def parse_skills(skills_text: str) -> Dict[str, List[str]]:
-    """Parse skills section with categorization."""
+def parse_skills(skills_text: str, lite: bool = False) -> Dict[str, List[str]]:
+    """Parse skills section with categorization (without nltk in lite mode)."""
     if not skills_text:
         return {
             "technical": [],
@@ -515,8 +628,8 @@ def parse_skills(skills_text: str) -> Dict[str, List[str]]:
     # Remove punctuation and tokenize
     translator = str.maketrans('', '', string.punctuation)
     text_no_punct = skills_text_lower.translate(translator)
+    word_tokenize, sent_tokenize, stop_words = load_text_tools(lite)
     words = word_tokenize(text_no_punct)
-    stop_words = set(stopwords.words('english'))
     words = [w for w in words if w not in stop_words]
     
     # Skill category definitions
@@ -670,6 +783,10 @@ def extract_resume_sections(text: str, model, tokenizer) -> Dict[str, Any]:
         print("No model available for section extraction, using fallback", file=sys.stderr)
         return extract_sections_fallback(text)
     
+    # Too long for one pass: generate per chunk and merge the results
+    if MAP_REDUCE_SECTIONS and count_tokens(text, tokenizer) > SECTION_CHUNK_TOKENS:
+        return extract_resume_sections_batch([text], model, tokenizer)[0]
+    
     try:
         # Replace multiple newlines with a single one to avoid truncation issues
         normalized_text = re.sub(r'\n+', '\n', text)
@@ -678,38 +795,118 @@ def extract_resume_sections(text: str, model, tokenizer) -> Dict[str, Any]:
         # BART typically has 1024 token limit, but we'll use 900 to be safe
         tokenized = tokenizer.encode(normalized_text, return_tensors="pt", truncation=True, max_length=900)
         
-        # Generate summary/extraction
+        # Generate summary/extraction, stopping once the inference budget is spent
+        stopping_criteria, deadline = deadline_stopping_criteria(time.time() + INFERENCE_TIMEOUT)
         output = model.generate(
             tokenized,
             max_length=300,
             num_beams=4,
-            early_stopping=True
+            early_stopping=True,
+            stopping_criteria=stopping_criteria
         )
+        if deadline.timed_out:
+            print("Model inference timed out, salvaging partial output", file=sys.stderr)
         
         # Decode the output
         decoded_output = tokenizer.decode(output[0], skip_special_tokens=True)
         
-        # Parse the structured output - should be in format like:
-        # EXPERIENCE: ... EDUCATION: ... SKILLS: ... etc.
-        sections = {}
-        section_matches = re.finditer(r'([A-Z]+):\s*((?:(?!(?:[A-Z]+):).)*)', decoded_output, re.DOTALL)
-        
-        for match in section_matches:
-            section_name = match.group(1).lower()
-            section_content = match.group(2).strip()
-            sections[section_name] = section_content
-        
-        # Check if we got meaningful sections
-        if not sections or not any(sections.values()):
-            print("Transformer model output seems invalid, falling back to regex", file=sys.stderr)
-            return extract_sections_fallback(text)
-        
-        return sections
+        return sections_from_model_output(text, decoded_output)
     except Exception as e:
         print(f"Error in transformer model processing: {str(e)}", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
         return extract_sections_fallback(text)
 
+def extract_resume_sections_batch(texts: List[str], model, tokenizer, batch_size: int = 8) -> List[Dict[str, Any]]:
+    """Extract sections for many resumes, generating over batches of similar token length."""
+    if not model or not tokenizer:
+        print("No model available for section extraction, using fallback", file=sys.stderr)
+        return [extract_sections_fallback(text) for text in texts]
+    
+    # Long resumes contribute one chunk per context window, merged again at the end
+    owners, texts = split_long_resumes(texts, tokenizer)
+    
+    # Tokenize each resume exactly like the single-item path does
+    encodings = []
+    for text in texts:
+        normalized_text = re.sub(r'\n+', '\n', text)
+        encodings.append(tokenizer.encode(normalized_text, truncation=True, max_length=900))
+    
+    # Sort by token length so each batch holds similarly sized inputs and padding stays small
+    order = sorted(range(len(texts)), key=lambda i: len(encodings[i]))
+    results = [None] * len(texts)
+    
+    for start in range(0, len(order), max(1, batch_size)):
+        group = order[start:start + batch_size]
+        try:
+            stopping_criteria, deadline = deadline_stopping_criteria(time.time() + INFERENCE_TIMEOUT * len(group))
+            padded = tokenizer.pad({"input_ids": [encodings[i] for i in group]}, return_tensors="pt")
+            with torch.no_grad():
+                output = model.generate(
+                    padded["input_ids"],
+                    attention_mask=padded["attention_mask"],
+                    max_length=300,
+                    num_beams=4,
+                    early_stopping=True,
+                    stopping_criteria=stopping_criteria
+                )
+            if deadline.timed_out:
+                print("Batched model inference timed out, salvaging partial output", file=sys.stderr)
+            decoded_outputs = tokenizer.batch_decode(output, skip_special_tokens=True)
+            for i, decoded_output in zip(group, decoded_outputs):
+                results[i] = sections_from_model_output(texts[i], decoded_output)
+        except Exception as e:
+            print(f"Error in batched transformer model processing: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            for i in group:
+                results[i] = extract_sections_fallback(texts[i])
+    
+    return merge_chunk_results(owners, results)
+
+def count_tokens(text: str, tokenizer) -> int:
+    """Number of model input tokens in text, without special tokens."""
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+def split_long_resumes(texts: List[str], tokenizer) -> Tuple[List[List[int]], List[str]]:
+    """Split resumes that exceed SECTION_CHUNK_TOKENS at section boundaries.
+    
+    Returns the chunk indices belonging to each resume and the flat chunk list.
+    """
+    owners, chunks = [], []
+    for text in texts:
+        if MAP_REDUCE_SECTIONS:
+            pieces = split_for_context(text, lambda piece: count_tokens(piece, tokenizer), SECTION_CHUNK_TOKENS)
+        else:
+            pieces = [text]
+        if len(pieces) > 1:
+            print(f"Resume exceeds the model context, extracting sections from {len(pieces)} chunks", file=sys.stderr)
+        owners.append(list(range(len(chunks), len(chunks) + len(pieces))))
+        chunks.extend(pieces)
+    return owners, chunks
+
+def merge_chunk_results(owners: List[List[int]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge per-chunk section results back into one result per resume."""
+    return [results[indices[0]] if len(indices) == 1 else merge_section_results([results[i] for i in indices])
+            for indices in owners]
+
+def sections_from_model_output(text: str, decoded_output: str) -> Dict[str, Any]:
+    """Turn decoded BART output into a sections dict, falling back to regex if it is unusable."""
+    # Parse the structured output - should be in format like:
+    # EXPERIENCE: ... EDUCATION: ... SKILLS: ... etc.
+    sections = {}
+    section_matches = re.finditer(r'([A-Z]+):\s*((?:(?!(?:[A-Z]+):).)*)', decoded_output, re.DOTALL)
+    
+    for match in section_matches:
+        section_name = match.group(1).lower()
+        section_content = match.group(2).strip()
+        sections[section_name] = section_content
+    
+    # Check if we got meaningful sections
+    if not sections or not any(sections.values()):
+        print("Transformer model output seems invalid, falling back to regex", file=sys.stderr)
+        return extract_sections_fallback(text)
+    
+    return sections
+
 def extract_sections_fallback(text: str) -> Dict[str, Any]:
     """Extract sections from resume text using regex patterns."""
     # Define section headers to look for
@@ -835,6 +1032,8 @@ def extract_sections_fallback(text: str) -> Dict[str, Any]:
                 sections['skills'] = content
                 break
     
+    # Regex stood in for the model; parse_resume neither caches nor hides that
+    sections['fallback'] = True
     return sections
 
 def extract_summary_highlights(text: str) -> Dict[str, Any]:
@@ -925,119 +1124,383 @@ def extract_summary_highlights(text: str) -> Dict[str, Any]:
     
     return highlights
 
-def parse_resume(file_path: str) -> Dict[str, Any]:
-    """Parse a resume file and extract structured information."""
+def read_resume_text(file_path: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Extract text from a resume file, returning (text, error_result)."""
+    # Determine file type from extension
+    file_ext = os.path.splitext(file_path)[1].lower()
+    
+    # Extract text from file
+    text = ""
+    if file_ext in ['.pdf']:
+        text = extract_text_from_pdf(file_path)
+    elif file_ext in ['.docx', '.doc']:
+        text = extract_text_from_docx(file_path)
+    else:
+        return "", {
+            "success": False,
+            "error": "Unsupported file format",
+            "details": f"The file extension {file_ext} is not supported. Please upload a PDF or DOCX file."
+        }
+    
+    # Check if text was successfully extracted
+    if not text or len(text.strip()) < 50:
+        return "", {
+            "success": False,
+            "error": "Failed to extract text",
+            "details": "The file appears to be empty or contains very little text. Please check the file and try again."
+        }
+    
+    return text, None
+
+def build_parse_result(text: str, sections: Dict[str, Any], ner_pipeline, lite: bool = False) -> Dict[str, Any]:
+    """Combine extracted sections and entities into the parser's output structure.
+    
+    Outside lite mode, a result built by the regex fallback (model not loaded,
+    timed out or unusable output) is flagged with "fallback": true.
+    """
+    # Extract personal information
+    personal_info = extract_entities(text, ner_pipeline)
+    
+    # Parse education
+    education_data = parse_education(sections.get('education', ''))
+    
+    # Parse experience
+    experience_data = parse_experience(sections.get('experience', ''))
+    
+    # Parse skills
+    skills_data = parse_skills(sections.get('skills', ''), lite)
+    
+    # Extract key highlights
+    highlights = extract_summary_highlights(text)
+    
+    # Build the final output
+    result = {
+        "success": True,
+        "name": personal_info.get('name', ''),
+        "email": personal_info.get('email', ''),
+        "phone": personal_info.get('phone', ''),
+        "linkedin": personal_info.get('linkedin', ''),
+        "github": personal_info.get('github', ''),
+        "website": personal_info.get('website', ''),
+        "summary": sections.get('summary', ''),
+        "education": education_data,
+        "experience": experience_data,
+        "skills": skills_data.get('uncategorized', []),
+        "technical_skills": skills_data.get('technical', []),
+        "soft_skills": skills_data.get('soft', []),
+        "language_skills": skills_data.get('languages', []),
+        "tools": skills_data.get('tools', []),
+        "highlights": highlights,
+        "organizations": personal_info.get('organizations', []),
+        "locations": personal_info.get('locations', []),
+        "certifications": [],  # Could extract these in future updates
+        "projects": [],        # Could extract these in future updates
+        "publications": []     # Could extract these in future updates
+    }
+    
+    # Add additional sections if present
+    if 'projects' in sections:
+        result['projects'] = sections['projects']
+    
+    if 'certifications' in sections:
+        result['certifications'] = sections['certifications']
+    
+    if 'publications' in sections:
+        result['publications'] = sections['publications']
+    
+    if 'awards' in sections:
+        result['awards'] = sections['awards']
+    
+    if 'languages' in sections and not result['language_skills']:
+        result['language_skills'] = sections['languages'].split(',')
+    
+    if 'interests' in sections:
+        result['interests'] = sections['interests']
+    
+    if not lite and (sections.get('fallback') or ner_pipeline is None):
+        result['fallback'] = True
+    
+    return result
+
+def _parse_failure(e: Exception) -> Dict[str, Any]:
+    """Log an unexpected parsing error and build the error result."""
+    print(f"Error parsing resume: {str(e)}", file=sys.stderr)
+    traceback.print_exc(file=sys.stderr)
+    return {
+        "success": False,
+        "error": "Failed to parse resume",
+        "details": str(e)
+    }
+
+def result_cache_key(file_path: str, lite: bool) -> Tuple[str, str]:
+    """Result cache key and parser name for this file under the current model configuration."""
+    parser = "enhanced-lite" if lite else "enhanced"
+    version = f"{PARSER_VERSION}-{INFERENCE_BACKEND}-{'int8' if USE_QUANTIZED_MODELS else 'fp32'}"
+    return cache_key(file_path, parser, version), parser
+
+def parse_resume(file_path: str, lite: Optional[bool] = None) -> Dict[str, Any]:
+    """Parse a resume file and extract structured information.
+    
+    With lite=True (or RESUME_PARSER_LITE=1) only the regex stages run and
+    torch/transformers are never imported.
+    """
+    if lite is None:
+        lite = LITE_MODE
+    
     try:
-        # Determine file type from extension
-        file_ext = os.path.splitext(file_path)[1].lower()
+        # Same file parsed before by this parser: skip extraction and inference
+        key, parser = result_cache_key(file_path, lite)
+        cached = get_cached_result(key)
+        if cached is not None:
+            return cached
         
-        # Extract text from file
-        text = ""
-        if file_ext in ['.pdf']:
-            text = extract_text_from_pdf(file_path)
-        elif file_ext in ['.docx', '.doc']:
-            text = extract_text_from_docx(file_path)
-        else:
-            return {
-                "success": False,
-                "error": "Unsupported file format",
-                "details": f"The file extension {file_ext} is not supported. Please upload a PDF or DOCX file."
-            }
-        
-        # Check if text was successfully extracted
-        if not text or len(text.strip()) < 50:
-            return {
-                "success": False,
-                "error": "Failed to extract text",
-                "details": "The file appears to be empty or contains very little text. Please check the file and try again."
-            }
+        text, error = read_resume_text(file_path)
+        if error:
+            return error
         
-        # Load NER model
-        ner_pipeline = load_ner_model()
-        
-        # Load BART model for section extraction
-        model, tokenizer = load_resume_parser_model()
+        if lite:
+            ner_pipeline, model, tokenizer = None, None, None
+        else:
+            # Load NER model
+            ner_pipeline = load_ner_model()
+            
+            # Load BART model for section extraction
+            model, tokenizer = load_resume_parser_model()
         
         # Extract sections from resume
         sections = extract_resume_sections(text, model, tokenizer)
         
-        # Extract personal information
-        personal_info = extract_entities(text, ner_pipeline)
-        
-        # Parse education
-        education_data = parse_education(sections.get('education', ''))
-        
-        # Parse experience
-        experience_data = parse_experience(sections.get('experience', ''))
-        
-        # Parse skills
-        skills_data = parse_skills(sections.get('skills', ''))
-        
-        # Extract key highlights
-        highlights = extract_summary_highlights(text)
-        
-        # Build the final output
-        result = {
-            "success": True,
-            "name": personal_info.get('name', ''),
-            "email": personal_info.get('email', ''),
-            "phone": personal_info.get('phone', ''),
-            "linkedin": personal_info.get('linkedin', ''),
-            "github": personal_info.get('github', ''),
-            "website": personal_info.get('website', ''),
-            "summary": sections.get('summary', ''),
-            "education": education_data,
-            "experience": experience_data,
-            "skills": skills_data.get('uncategorized', []),
-            "technical_skills": skills_data.get('technical', []),
-            "soft_skills": skills_data.get('soft', []),
-            "language_skills": skills_data.get('languages', []),
-            "tools": skills_data.get('tools', []),
-            "highlights": highlights,
-            "organizations": personal_info.get('organizations', []),
-            "locations": personal_info.get('locations', []),
-            "certifications": [],  # Could extract these in future updates
-            "projects": [],        # Could extract these in future updates
-            "publications": []     # Could extract these in future updates
-        }
-        
-        # Add additional sections if present
-        if 'projects' in sections:
-            result['projects'] = sections['projects']
-        
-        if 'certifications' in sections:
-            result['certifications'] = sections['certifications']
-        
-        if 'publications' in sections:
-            result['publications'] = sections['publications']
-        
-        if 'awards' in sections:
-            result['awards'] = sections['awards']
-        
-        if 'languages' in sections and not result['language_skills']:
-            result['language_skills'] = sections['languages'].split(',')
-        
-        if 'interests' in sections:
-            result['interests'] = sections['interests']
-        
+        result = build_parse_result(text, sections, ner_pipeline, lite)
+        # Degraded results would otherwise be served under the full-model key until the TTL runs out
+        if not result.get('fallback'):
+            store_result(key, parser, result)
         return result
     
     except Exception as e:
-        print(f"Error parsing resume: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        return {
-            "success": False,
-            "error": "Failed to parse resume",
-            "details": str(e)
-        }
+        return _parse_failure(e)
+
+def parse_resumes_batched(file_paths: List[str], batch_size: int = 8) -> List[Dict[str, Any]]:
+    """Parse several resumes, running BART section extraction over length-bucketed batches."""
+    results = [None] * len(file_paths)
+    keys = {}
+    texts = {}
+    for i, file_path in enumerate(file_paths):
+        try:
+            keys[i], parser = result_cache_key(file_path, False)
+            cached = get_cached_result(keys[i])
+            if cached is not None:
+                results[i] = cached
+                continue
+            text, error = read_resume_text(file_path)
+            if error:
+                results[i] = error
+            else:
+                texts[i] = text
+        except Exception as e:
+            results[i] = _parse_failure(e)
+    
+    if texts:
+        ner_pipeline = load_ner_model()
+        model, tokenizer = load_resume_parser_model()
+        indices = list(texts)
+        try:
+            all_sections = extract_resume_sections_batch([texts[i] for i in indices], model, tokenizer, batch_size)
+        except Exception as e:
+            print(f"Batched section extraction failed, parsing one by one: {str(e)}", file=sys.stderr)
+            all_sections = [extract_resume_sections(texts[i], model, tokenizer) for i in indices]
+        
+        for i, sections in zip(indices, all_sections):
+            try:
+                results[i] = build_parse_result(texts[i], sections, ner_pipeline)
+                if not results[i].get('fallback'):
+                    store_result(keys[i], parser, results[i])
+            except Exception as e:
+                results[i] = _parse_failure(e)
+    
+    return results
+
+def collect_batch_files(sources: List[str]) -> List[str]:
+    """Expand directories, glob patterns and @manifest files into resume paths."""
+    files = []
+    for source in sources:
+        if source.startswith('@'):
+            # Manifest file: one path per line, blank lines and comments ignored
+            with open(source[1:], 'r', encoding='utf-8') as f:
+                candidates = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        elif os.path.isdir(source):
+            candidates = []
+            for root, _, names in os.walk(source):
+                candidates.extend(os.path.join(root, name) for name in names)
+            candidates.sort()
+        elif any(c in source for c in '*?['):
+            candidates = sorted(glob.glob(source, recursive=True))
+        else:
+            candidates = [source]
+        
+        files.extend(c for c in candidates if os.path.splitext(c)[1].lower() in SUPPORTED_EXTENSIONS)
+    
+    # Remove duplicates while keeping order
+    return list(dict.fromkeys(files))
+
+def load_completed_files(output_path: str, retry_failed: bool = False) -> Set[str]:
+    """Read an existing JSONL output file and return the files already parsed.
+    
+    With retry_failed, failed results and flagged fallback results do not count as parsed.
+    """
+    completed = set()
+    if not output_path or not os.path.isfile(output_path):
+        return completed
+    
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written last line from an interrupted run
+                continue
+            if 'file' in record and ((record.get('success') and not record.get('fallback')) or not retry_failed):
+                completed.add(record['file'])
+    return completed
+
+def _init_batch_worker(torch_threads: int):
+    """Limit torch intra-op threads in a forked batch worker."""
+    if torch is not None:
+        torch.set_num_threads(torch_threads)
+
+def _parse_batch_chunk(file_paths: List[str], gen_batch_size: int = 1, lite: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+    """Parse a chunk of files inside a batch worker, keeping each path with its result."""
+    if gen_batch_size > 1 and len(file_paths) > 1 and not lite:
+        return list(zip(file_paths, parse_resumes_batched(file_paths, gen_batch_size)))
+    return [(file_path, parse_resume(file_path, lite)) for file_path in file_paths]
+
+def _iter_batch_results(pending: List[str], workers: int, torch_threads: Optional[int], gen_batch_size: int = 1,
+                        lite: bool = False, summary: Optional[Dict[str, Any]] = None):
+    """Yield (file_path, result) pairs, in parallel when forked workers are available.
+    
+    The number of worker processes actually used is recorded in summary["workers"].
+    """
+    if summary is None:
+        summary = {}
+    if workers > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        # Spawned workers would each reload the models, which defeats the point
+        print("Process pool needs the 'fork' start method; parsing serially", file=sys.stderr)
+        workers = 1
+    
+    # With batched generation, hand out a few generation batches' worth of files at
+    # a time so length bucketing has similarly sized resumes to group together
+    chunk_size = gen_batch_size * GENERATION_BUCKET_WINDOW if gen_batch_size > 1 else 1
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    parse_chunk = functools.partial(_parse_batch_chunk, gen_batch_size=gen_batch_size, lite=lite)
+    
+    if workers <= 1 or len(chunks) <= 1:
+        summary["workers"] = 1
+        for chunk in chunks:
+            yield from parse_chunk(chunk)
+        return
+    
+    # Workers beyond the number of chunks would only sit idle
+    workers = min(workers, len(chunks))
+    summary["workers"] = workers
+    
+    # Split the cores between workers so torch doesn't oversubscribe the CPU
+    if not torch_threads:
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"Starting {workers} workers with {torch_threads} torch thread(s) each", file=sys.stderr)
+    
+    # Move the loaded models out of the garbage collector's reach so that
+    # collections in the workers don't touch (and copy) the shared pages
+    gc.collect()
+    gc.freeze()
+    try:
+        context = multiprocessing.get_context('fork')
+        with context.Pool(workers, initializer=_init_batch_worker, initargs=(torch_threads,)) as pool:
+            for chunk_results in pool.imap_unordered(parse_chunk, chunks):
+                yield from chunk_results
+    finally:
+        gc.unfreeze()
+
+def run_batch(sources: List[str], output_path: Optional[str] = None, retry_failed: bool = False,
+              workers: int = 1, torch_threads: Optional[int] = None, gen_batch_size: int = 1,
+              lite: Optional[bool] = None) -> Dict[str, Any]:
+    """Parse many resumes with a single set of loaded models, writing one JSON result per line."""
+    files = collect_batch_files(sources)
+    completed = load_completed_files(output_path, retry_failed)
+    pending = [f for f in files if f not in completed]
+    
+    summary = {
+        "total": len(files),
+        "skipped": len(files) - len(pending),
+        "parsed": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "workers": 0
+    }
+    print(f"Batch: {len(files)} files found, {summary['skipped']} already done, {len(pending)} to parse", file=sys.stderr)
+    
+    # Models are cached in module globals, so they load once for the whole batch
+    # (and are inherited copy-on-write by forked workers)
+    if lite is None:
+        lite = LITE_MODE
+    if not lite:
+        load_ner_model()
+        load_resume_parser_model()
+    
+    start_time = time.time()
+    out = open(output_path, 'a', encoding='utf-8') if output_path else sys.stdout
+    try:
+        for file_path, result in _iter_batch_results(pending, workers, torch_threads, gen_batch_size, lite, summary):
+            record = {"file": file_path}
+            record.update(result)
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+            
+            summary["parsed"] += 1
+            if result.get("success"):
+                summary["succeeded"] += 1
+            else:
+                summary["failed"] += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    elapsed = time.time() - start_time
+    summary["elapsed_seconds"] = round(elapsed, 2)
+    summary["files_per_second"] = round(summary["parsed"] / elapsed, 3) if elapsed > 0 else 0.0
+    print(
+        f"Batch complete: {summary['parsed']} parsed ({summary['succeeded']} ok, {summary['failed']} failed), "
+        f"{summary['skipped']} skipped in {summary['elapsed_seconds']}s "
+        f"({summary['files_per_second']} files/s)",
+        file=sys.stderr
+    )
+    return summary
 
 if __name__ == "__main__":
     # Check command line arguments
-    if len(sys.argv) != 2:
+    arg_parser = argparse.ArgumentParser(description="Parse resumes into structured JSON")
+    arg_parser.add_argument("paths", nargs="+", help="Resume file, or with --batch: directories, globs or @manifest files")
+    arg_parser.add_argument("--batch", action="store_true", help="Parse many files into JSONL")
+    arg_parser.add_argument("--output", "-o", help="JSONL output file (default: stdout); existing results are skipped")
+    arg_parser.add_argument("--retry-failed", action="store_true",
+                            help="Re-parse files whose earlier result failed or fell back to regex extraction")
+    arg_parser.add_argument("--workers", type=int, default=1, help="Parallel worker processes for --batch")
+    arg_parser.add_argument("--torch-threads", type=int, help="Torch threads per worker (default: cores / workers)")
+    arg_parser.add_argument("--lite", action="store_true", default=None,
+                            help="Regex-only parsing without loading torch/transformers")
+    arg_parser.add_argument("--gen-batch-size", type=int, default=1,
+                            help="Resumes per batched BART generation call in --batch (1 disables batching)")
+    args = arg_parser.parse_args()
+    
+    if args.batch:
+        run_batch(args.paths, args.output, args.retry_failed, args.workers, args.torch_threads, args.gen_batch_size,
+                  args.lite)
+        sys.exit(0)
+    
+    if len(args.paths) != 1:
         print("Usage: python enhanced_resume_parser.py <resume_file_path>", file=sys.stderr)
+        print("       python enhanced_resume_parser.py --batch <dir|glob|@manifest>... [--output results.jsonl]", file=sys.stderr)
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args.paths[0]
     
     # Check if file exists
     if not os.path.isfile(file_path):
@@ -1049,7 +1512,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Parse the resume
-    result = parse_resume(file_path)
+    result = parse_resume(file_path, args.lite)
     
     # Print the result as JSON
-    print(json.dumps(result, indent=2)) 
\ No newline at end of file
+    print(json.dumps(result, indent=2)) 
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Wall-clock deadlines for model loading and generation.
+
+Both transformer parsers used to check their timeouts only after the slow call
+had already returned, so an overrunning load or generate() still cost its full
+duration. These helpers enforce the budget while the work is in progress:
+
+- load_with_deadline() runs a model load in a background thread and stops
+  waiting once the timeout passes. A load that overruns keeps going in the
+  background and later calls pick up its result instead of starting again.
+  A one-shot run can exit (killing that daemon thread) before it finishes, so
+  save_model_cache() writes the local model cache under a temporary name and
+  renames it into place only once complete.
+- deadline_stopping_criteria() stops generate() at the first decoding step
+  past the deadline, so the partial output can go to the parser's JSON
+  salvage and fallback logic.
+"""
+import os
+import shutil
+import threading
+import time
+from typing import Any, Callable, Dict
+
+# label -> state of the (possibly still running) background load
+MODEL_LOADS: Dict[str, Dict[str, Any]] = {}
+MODEL_LOADS_LOCK = threading.Lock()
+
+def load_with_deadline(label: str, loader: Callable[[], Any], timeout: float) -> Any:
+    """Run loader() in a background thread, raising TimeoutError after timeout seconds."""
+    with MODEL_LOADS_LOCK:
+        state = MODEL_LOADS.get(label)
+        # Start a new load unless one is running or has already succeeded
+        if state is None or (state["done"].is_set() and state["error"] is not None):
+            state = {"done": threading.Event(), "result": None, "error": None}
+
+            def run():
+                try:
+                    state["result"] = loader()
+                except Exception as e:
+                    state["error"] = e
+                finally:
+                    state["done"].set()
+
+            threading.Thread(target=run, name=f"load-{label}", daemon=True).start()
+            MODEL_LOADS[label] = state
+
+    if not state["done"].wait(timeout):
+        raise TimeoutError(f"Loading {label} timed out after {timeout} seconds")
+    if state["error"] is not None:
+        raise state["error"]
+    return state["result"]
+
+def save_model_cache(path: str, *parts: Any):
+    """save_pretrained() each part into path, which only appears once every file is written."""
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    for part in parts:
+        part.save_pretrained(temp_path)
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        # Another process finished saving the same model first
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+def deadline_stopping_criteria(deadline: float):
+    """Build a StoppingCriteriaList that ends generation once time.time() passes deadline.
+
+    Returns (stopping_criteria, criterion); criterion.timed_out tells the caller
+    whether the output was cut short.
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class DeadlineCriteria(StoppingCriteria):
+        def __init__(self):
+            self.timed_out = False
+
+        def __call__(self, input_ids, scores, **kwargs):
+            if time.time() >= deadline:
+                self.timed_out = True
+            # One flag per sequence, as newer transformers versions expect
+            return torch.full((input_ids.shape[0],), self.timed_out, dtype=torch.bool, device=input_ids.device)
+
+    criterion = DeadlineCriteria()
+    return StoppingCriteriaList([criterion]), criterion
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Concurrent batch parsing of resumes through the DeepSeek/OpenRouter API.
+
+send_to_deepseek_ai() sends one request at a time and sleeps between retries,
+so a bulk run spends most of its time waiting. This engine keeps up to
+--concurrency requests in flight from an asyncio event loop:
+
+- a token bucket caps the request rate (--rps, with --burst headroom);
+- a 429 pauses all new requests for the server's Retry-After (or an
+  exponential backoff when the header is missing) and halves the number of
+  requests allowed in flight;
+- the in-flight cap grows back by one after every run of successful calls.
+
+Requests reuse the parser's pooled keep-alive session from worker threads, and
+results go through the same JSON validation, fallback and result cache as
+process_resume().
+
+Usage:
+    python llm_batch.py <dir|glob|@manifest>... [--output results.jsonl] [--concurrency 4] [--rps 1]
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import functools
+import email.utils
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+
+import requests
+
+import deepseek_resume_parser as deepseek
+from result_cache import cache_key, get_cached
+from enhanced_resume_parser import collect_batch_files, load_completed_files
+
+# Successful calls needed before the in-flight cap grows by one
+CONCURRENCY_INCREASE_AFTER = 10
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AdaptiveConcurrency:
+    """Caps the requests in flight: halved on rate limiting, grown back by one after a run of successes."""
+
+    def __init__(self, max_limit: int, increase_after: int = CONCURRENCY_INCREASE_AFTER):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.increase_after = increase_after
+        self.in_flight = 0
+        self.successes = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc_info):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    async def on_success(self):
+        async with self.condition:
+            self.successes += 1
+            if self.successes >= self.increase_after and self.limit < self.max_limit:
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify_all()
+
+    async def on_rate_limited(self):
+        async with self.condition:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+            print(f"Rate limited, reducing concurrency to {self.limit}", file=sys.stderr)
+
+class LlmBatchEngine:
+    """Sends chat completion requests concurrently within the configured rate limits."""
+
+    def __init__(self, concurrency: int = 4, requests_per_second: float = 1.0,
+                 burst: Optional[float] = None, max_retries: int = 3):
+        self.bucket = TokenBucket(requests_per_second, burst if burst is not None else concurrency)
+        self.limiter = AdaptiveConcurrency(concurrency)
+        self.max_retries = max_retries
+        # Blocking HTTP calls run here; one thread per request that may be in flight
+        self.executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="llm-request")
+        self.paused_until = 0.0
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "short_circuited": 0}
+
+    async def _wait_for_pause(self):
+        delay = self.paused_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.paused_until - time.monotonic()
+
+    async def complete(self, text: str) -> str:
+        """Parse cleaned resume text into a JSON string, falling back to regex extraction."""
+        url, headers, payload = deepseek.build_deepseek_request(text)
+        session = deepseek.get_http_session()
+        post = functools.partial(session.post, url, headers=headers, json=payload,
+                                 timeout=(deepseek.HTTP_CONNECT_TIMEOUT, deepseek.HTTP_READ_TIMEOUT))
+        loop = asyncio.get_running_loop()
+        wait_time = 2  # seconds, doubled after each failed attempt
+
+        for attempt in range(1, self.max_retries + 1):
+            await self._wait_for_pause()
+            if not deepseek.LLM_BREAKER.allow_request():
+                self.stats["short_circuited"] += 1
+                print("LLM circuit open, using fallback method without calling the API", file=sys.stderr)
+                return deepseek.flag_fallback(deepseek.generate_fallback_json(text), "AI service unavailable (circuit open)")
+            await self.bucket.acquire()
+            async with self.limiter:
+                self.stats["requests"] += 1
+                try:
+                    response = await loop.run_in_executor(self.executor, post)
+                except requests.exceptions.RequestException as e:
+                    print(f"Network error (attempt {attempt}/{self.max_retries}): {e}", file=sys.stderr)
+                    response = None
+
+            if response is not None and response.status_code == 200:
+                deepseek.LLM_BREAKER.record_success()
+                await self.limiter.on_success()
+                # json_from_ai_response falls back to regex extraction on an unusable answer
+                return deepseek.flag_api_fallback(deepseek.json_from_ai_response(response.json(), text))
+
+            # Only network and server errors mean an outage; rate limits and request errors leave the breaker alone
+            if response is None or response.status_code >= 500:
+                deepseek.LLM_BREAKER.record_failure()
+            if response is not None and response.status_code == 429:
+                self.stats["rate_limited"] += 1
+                delay = retry_after_seconds(response)
+                delay = wait_time if delay is None else delay
+                # Every request waits, not just this one: the limit is per account
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                await self.limiter.on_rate_limited()
+                print(f"Rate limit error, pausing {delay:.1f} seconds (attempt {attempt}/{self.max_retries})", file=sys.stderr)
+            else:
+                self.stats["errors"] += 1
+                if response is not None:
+                    print(f"Error: API call failed with status {response.status_code}: {response.text[:200]}", file=sys.stderr)
+                await asyncio.sleep(wait_time)
+            wait_time *= 2
+
+        print("All API attempts failed. Using fallback method.", file=sys.stderr)
+        return deepseek.flag_fallback(deepseek.generate_fallback_json(text), "AI service failed after all retries")
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+def prepare_resume(file_path: str) -> Dict[str, Any]:
+    """Cache lookup and text extraction for one file (blocking, runs in a worker thread)."""
+    key = cache_key(file_path, deepseek.PARSER_NAME, deepseek.PARSER_VERSION)
+    cached = get_cached(key)
+    if cached is not None:
+        return {"key": key, "cached": cached}
+    text = deepseek.read_resume_file(file_path)
+    return {"key": key, "text": deepseek.clean_text(text) if text else ""}
+
+def record_for(file_path: str, json_text: str) -> Dict[str, Any]:
+    """JSONL record for a parsed file, in the same shape as the enhanced parser's batch output."""
+    try:
+        parsed = json.loads(json_text)
+    except json.JSONDecodeError:
+        parsed = {"error": "AI returned invalid JSON"}
+    if not isinstance(parsed, dict):
+        parsed = {"result": parsed}
+    record = {"file": file_path, "success": "error" not in parsed}
+    record.update(parsed)
+    return record
+
+async def _parse_files(pending: List[str], engine: LlmBatchEngine, out, summary: Dict[str, Any]):
+    queue = asyncio.Queue()
+    for file_path in pending:
+        queue.put_nowait(file_path)
+    loop = asyncio.get_running_loop()
+
+    async def worker():
+        while True:
+            try:
+                file_path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                prepared = await loop.run_in_executor(None, prepare_resume, file_path)
+                if "cached" in prepared:
+                    json_text = prepared["cached"]
+                    summary["cached"] += 1
+                elif not prepared["text"]:
+                    json_text = json.dumps({"error": "Failed to extract text from resume"})
+                else:
+                    json_text = await engine.complete(prepared["text"])
+                    deepseek.validate_and_cache(prepared["key"], json_text)
+                record = record_for(file_path, json_text)
+            except Exception as e:
+                print(f"Error parsing {file_path}: {str(e)}", file=sys.stderr)
+                record = {"file": file_path, "success": False, "error": str(e)}
+
+            # Single-threaded event loop: writes never interleave
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+            summary["parsed"] += 1
+            summary["succeeded" if record["success"] else "failed"] += 1
+            if record.get("fallback"):
+                # Placeholder parse from regex extraction; --retry-failed runs it again
+                summary["fallback"] += 1
+
+    # A few more workers than request slots keep text extraction ahead of the API
+    workers = min(len(pending), engine.limiter.max_limit * 2)
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+def run_llm_batch(sources: List[str], output_path: Optional[str] = None, retry_failed: bool = False,
+                  concurrency: int = 4, requests_per_second: float = 1.0, burst: Optional[float] = None) -> Dict[str, Any]:
+    """Parse many resumes through the API concurrently, writing one JSON result per line."""
+    files = collect_batch_files(sources)
+    completed = load_completed_files(output_path, retry_failed)
+    pending = [f for f in files if f not in completed]
+    summary = {
+        "total": len(files),
+        "skipped": len(files) - len(pending),
+        "parsed": 0,
+        "cached": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "fallback": 0
+    }
+    print(f"LLM batch: {len(files)} files found, {summary['skipped']} already done, {len(pending)} to parse", file=sys.stderr)
+    if concurrency > deepseek.HTTP_POOL_SIZE:
+        print(f"Warning: concurrency {concurrency} exceeds RESUME_PARSER_HTTP_POOL_SIZE={deepseek.HTTP_POOL_SIZE}; "
+              "extra connections will not be kept alive", file=sys.stderr)
+
+    engine = LlmBatchEngine(concurrency, requests_per_second, burst)
+    start_time = time.time()
+    out = open(output_path, 'a', encoding='utf-8') if output_path else sys.stdout
+    try:
+        if pending:
+            asyncio.run(_parse_files(pending, engine, out, summary))
+    finally:
+        engine.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.time() - start_time
+    summary.update(engine.stats)
+    summary["final_concurrency"] = engine.limiter.limit
+    summary["elapsed_seconds"] = round(elapsed, 2)
+    summary["files_per_second"] = round(summary["parsed"] / elapsed, 3) if elapsed > 0 else 0.0
+    print(f"LLM batch complete: {json.dumps(summary)}", file=sys.stderr)
+    return summary
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Parse many resumes through the DeepSeek API concurrently")
+    arg_parser.add_argument("paths", nargs="+", help="Directories, globs or @manifest files")
+    arg_parser.add_argument("--output", "-o", help="JSONL output file (default: stdout); existing results are skipped")
+    arg_parser.add_argument("--retry-failed", action="store_true",
+                            help="Re-parse files whose earlier result failed or fell back to regex extraction")
+    arg_parser.add_argument("--concurrency", type=int, default=4, help="Maximum requests in flight")
+    arg_parser.add_argument("--rps", type=float, default=1.0, help="Average requests per second (0 = unlimited)")
+    arg_parser.add_argument("--burst", type=float, help="Token bucket size (default: --concurrency)")
+    args = arg_parser.parse_args()
+
+    run_llm_batch(args.paths, args.output, args.retry_failed, args.concurrency, args.rps, args.burst)
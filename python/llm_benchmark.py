@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Load test for the DeepSeek API path, offline by default.
+
+Starts mock_llm_server.py in-process (with the given latency and fault
+rates) and points the parser at it, or uses --url for another endpoint. The
+resumes are extracted and cleaned once up front; then every request goes
+through the parser's real retry, repair and fallback logic at the chosen
+concurrency, either one blocking send_to_deepseek_ai() call per thread
+(--mode sync) or through llm_batch's rate-limited engine (--mode batch).
+
+Reports throughput, latency percentiles and how many answers came from the
+API, the fallback or neither, plus the mock's request and fault counters.
+
+Usage:
+    python llm_benchmark.py [<dir|glob|@manifest>...] [--synthetic 20] [--concurrency 4] [--mode sync|batch]
+                            [--latency 2] [--rate-429 0.1] [--rate-truncated 0.1] [--replay recordings.jsonl]
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+
+import deepseek_resume_parser as deepseek
+from circuit_breaker import CircuitBreaker
+from enhanced_resume_parser import collect_batch_files
+from mock_llm_server import add_fault_arguments, mock_from_arguments, start_server
+
+SYNTHETIC_SKILLS = ["Python", "Java", "Go", "SQL", "Docker", "Kubernetes", "AWS", "React", "Linux"]
+
+def synthetic_resumes(count: int) -> List[str]:
+    """Resume-like texts for runs without real files."""
+    resumes = []
+    for i in range(count):
+        skills = ", ".join(SYNTHETIC_SKILLS[j % len(SYNTHETIC_SKILLS)] for j in range(i, i + 5))
+        resumes.append(
+            f"Candidate {i}\ncandidate{i}@example.com\n"
+            f"WORK EXPERIENCE\nSoftware Engineer at Company {i}, 2018-Present\n"
+            f"- Built services handling {1000 * (i + 1)} requests per second\n"
+            f"EDUCATION\nB.S. Computer Science, State University, 2014-2018\n"
+            f"SKILLS\n{skills}\n"
+        )
+    return resumes
+
+def load_texts(sources: List[str], synthetic: int) -> List[str]:
+    if not sources:
+        return synthetic_resumes(synthetic)
+    texts = []
+    for file_path in collect_batch_files(sources):
+        text = deepseek.read_resume_file(file_path)
+        if text:
+            texts.append(deepseek.clean_text(text))
+        else:
+            print(f"No text extracted from {file_path}, skipping", file=sys.stderr)
+    return texts
+
+def classify(json_text: Optional[str]) -> str:
+    """Where an answer came from: "api", "fallback" or "failed"."""
+    if not json_text:
+        return "failed"
+    try:
+        parsed = json.loads(json_text)
+    except json.JSONDecodeError:
+        return "failed"
+    if not isinstance(parsed, dict) or "name" not in parsed:
+        return "failed"
+    return "fallback" if deepseek.FALLBACK_MARKER in json_text or parsed.get("fallback") else "api"
+
+def _timed(parse, text: str) -> Dict[str, Any]:
+    start_time = time.monotonic()
+    try:
+        json_text = parse(text)
+    except Exception as e:
+        print(f"Parse raised: {str(e)}", file=sys.stderr)
+        json_text = None
+    return {"seconds": time.monotonic() - start_time, "outcome": classify(json_text)}
+
+def run_sync(texts: List[str], concurrency: int) -> List[Dict[str, Any]]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda text: _timed(deepseek.send_to_deepseek_ai, text), texts))
+
+def run_batch(texts: List[str], concurrency: int, requests_per_second: float) -> List[Dict[str, Any]]:
+    from llm_batch import LlmBatchEngine
+
+    async def run():
+        engine = LlmBatchEngine(concurrency, requests_per_second)
+        try:
+            async def one(text):
+                start_time = time.monotonic()
+                json_text = await engine.complete(text)
+                return {"seconds": time.monotonic() - start_time, "outcome": classify(json_text)}
+            return await asyncio.gather(*(one(text) for text in texts))
+        finally:
+            engine.close()
+
+    return asyncio.run(run())
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    latencies = [result["seconds"] for result in results]
+    outcomes = {"api": 0, "fallback": 0, "failed": 0}
+    for result in results:
+        outcomes[result["outcome"]] += 1
+    return {
+        "resumes": len(results),
+        "elapsed_seconds": round(elapsed, 2),
+        "resumes_per_second": round(len(results) / elapsed, 3) if elapsed > 0 else 0.0,
+        "latency_p50": round(percentile(latencies, 0.5), 2),
+        "latency_p95": round(percentile(latencies, 0.95), 2),
+        "latency_max": round(max(latencies), 2),
+        "outcomes": outcomes
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the DeepSeek API path against a mock or real endpoint")
+    arg_parser.add_argument("paths", nargs="*", help="Directories, globs or @manifest files (default: synthetic resumes)")
+    arg_parser.add_argument("--synthetic", type=int, default=20, help="Number of synthetic resumes when no paths are given")
+    arg_parser.add_argument("--concurrency", type=int, default=4, help="Parses in flight")
+    arg_parser.add_argument("--mode", choices=["sync", "batch"], default="sync",
+                            help="Threads calling send_to_deepseek_ai, or llm_batch's async engine")
+    arg_parser.add_argument("--rps", type=float, default=0.0, help="Request rate limit in batch mode (0 = unlimited)")
+    arg_parser.add_argument("--url", help="Benchmark this chat completions endpoint instead of a local mock")
+    arg_parser.add_argument("--no-stream", action="store_true", help="Request non-streamed completions")
+    add_fault_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    texts = load_texts(args.paths, args.synthetic)
+    if not texts:
+        arg_parser.error("No resumes to benchmark")
+
+    server = None
+    mock = None
+    # A private, in-memory breaker: fault injection must not open the circuit that real parses on
+    # this host read from the state file, and a circuit left open there must not skew the results
+    deepseek.LLM_BREAKER = CircuitBreaker(state_path=None)
+    if args.url:
+        deepseek.API_URL = args.url
+    else:
+        mock = mock_from_arguments(args)
+        server = start_server(mock)
+        host, port = server.server_address[:2]
+        deepseek.API_URL = f"http://{host}:{port}/v1/chat/completions"
+    deepseek.STREAM_RESPONSES = not args.no_stream
+    print(f"Benchmarking {len(texts)} resumes against {deepseek.API_URL} "
+          f"({args.mode}, concurrency {args.concurrency})", file=sys.stderr)
+
+    start_time = time.monotonic()
+    try:
+        if args.mode == "sync":
+            results = run_sync(texts, args.concurrency)
+        else:
+            results = run_batch(texts, args.concurrency, args.rps)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    report = summarize(results, time.monotonic() - start_time)
+    if mock is not None:
+        report["server"] = mock.metrics()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Prompt building and token budgeting for the DeepSeek/OpenRouter request.
+
+The request used to embed up to 12,000 characters of resume in the middle of
+a long instruction block and always asked for 3000 output tokens. Here:
+
+- the instructions and sample structure form a fixed system message, so every
+  request starts with the same prefix and provider-side prompt caching can
+  reuse it; only the user message (the resume) changes;
+- slim_resume_text() walks the section segmenter's blocks and drops page
+  numbers, "Curriculum Vitae" banners, declarations, "references on request"
+  lines, repeated page headers/footers and duplicate whitespace;
+- max_tokens is sized from the estimated input, between MIN_OUTPUT_TOKENS and
+  RESUME_PARSER_MAX_OUTPUT_TOKENS (default 3000).
+
+Usage (estimate tokens, cost and latency without calling the API):
+    python llm_prompt.py --dry-run <dir> [--input-price 0.55] [--output-price 2.19] [--output-tps 30]
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from typing import Dict, List, Any, Tuple
+
+from section_chunks import SECTION_HEADING, _blocks
+
+# Rough characters per token for English resume text and JSON (no local DeepSeek tokenizer)
+CHARS_PER_TOKEN = 4.0
+# Tokens of the JSON skeleton, plus output tokens expected per input token of resume
+OUTPUT_TOKENS_BASE = 300
+OUTPUT_TOKENS_PER_INPUT_TOKEN = 0.6
+# Headroom on the estimate before it becomes max_tokens
+OUTPUT_TOKENS_MARGIN = 1.3
+MIN_OUTPUT_TOKENS = 1500
+MAX_OUTPUT_TOKENS = int(os.environ.get("RESUME_PARSER_MAX_OUTPUT_TOKENS", "3000"))
+
+# Lines that carry no resume content. Page numbers only in unmistakable
+# pagination forms ("Page 2", "2 of 3", "- 2 -"): bare numbers and dates such
+# as "10" or "2016/2020" are resume data
+BOILERPLATE_LINE = re.compile(
+    r'^\s*(?:'
+    r'page\s*\d+(?:\s*(?:of|/)\s*\d+)?|'
+    r'\d+\s+of\s+\d+|'
+    r'[-\u2013\u2014]\s*\d{1,3}\s*[-\u2013\u2014]|'
+    r'curriculum\s+vitae|'
+    r'references?\s+(?:will\s+be\s+)?(?:available\s+)?(?:up)?on\s+request\.?|'
+    r'(?:private\s+and\s+)?confidential|'
+    r'declaration:?|'
+    r'i\s+hereby\s+declare\b.*'
+    r')\s*$',
+    re.IGNORECASE
+)
+# Lines worth deduplicating: contact details repeated in page headers, or long repeated sentences
+CONTACT_LINE = re.compile(r'@|https?://|www\.|linkedin|github', re.IGNORECASE)
+MIN_DUPLICATE_LENGTH = 25
+
+SYSTEM_PROMPT = """You are an expert resume parser. Extract key information from the resume text in the user message and format it according to the EXACT specified JSON structure. Be precise and accurate.
+
+*** CRITICALLY IMPORTANT: You MUST follow these rules ***
+1. Output ONLY valid JSON matching the exact structure below - no other text
+2. The skills section MUST be under the key "skill" (NOT "skills")
+3. DO NOT add any additional top-level fields that are not in the sample structure
+4. DO NOT include technical_skills, soft_skills, tools, email, phone, linkedin, or github as top-level fields
+5. DO NOT duplicate data between nested objects and the top level
+6. All data for a given type MUST be in its designated field only (e.g., contact info in contact_info object only)
+7. Follow the EXACT structure shown below - do not deviate or add extra fields
+
+The output MUST EXACTLY match this structure:
+{structure}
+
+IMPORTANT INSTRUCTIONS FOR SKILL EXTRACTION:
+1. Be exhaustive in extracting technical skills, tools, languages, and soft skills
+2. Categorize skills properly into technical_skills, soft_skills, and tools categories
+3. Include ALL programming languages, frameworks, platforms, and technologies mentioned
+4. Look for skill sections, but also extract skills mentioned throughout the entire resume
+5. For technical roles (DevOps, Cloud, etc.), include relevant cloud platforms, CI/CD tools, containers, etc.
+6. For Oracle/BI roles, include all Oracle-related technologies and reporting tools
+7. The skills section is critical - DO NOT leave this section empty or incomplete
+8. The skills key in the JSON MUST be "skill" (not "skills")
+
+Format your response ONLY as the exact JSON structure shown above - no explanations, no markdown, just the JSON."""
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text."""
+    return int(len(text) / CHARS_PER_TOKEN + 0.5)
+
+def slim_resume_text(text: str) -> str:
+    """Drop boilerplate lines, repeated headers/footers and duplicate whitespace."""
+    kept_blocks = []
+    seen_blocks = set()
+    seen_lines = set()
+    for heading, block in _blocks(text):
+        lines = []
+        for line in block.split('\n'):
+            line = re.sub(r'[ \t]+', ' ', line).strip()
+            if not line or BOILERPLATE_LINE.match(line):
+                continue
+            # Headings repeat legitimately (e.g. per page); other long or contact lines only once
+            is_heading = SECTION_HEADING.match(line)
+            if not is_heading and (len(line) >= MIN_DUPLICATE_LENGTH or CONTACT_LINE.search(line)):
+                if line in seen_lines:
+                    continue
+                seen_lines.add(line)
+            lines.append(line)
+        if not lines:
+            continue
+        slimmed = '\n'.join(lines)
+        # A whole block seen before is a page header or footer
+        if slimmed in seen_blocks and not SECTION_HEADING.match(slimmed):
+            continue
+        seen_blocks.add(slimmed)
+        kept_blocks.append(slimmed)
+    return '\n\n'.join(kept_blocks)
+
+def output_token_budget(resume_tokens: int) -> Tuple[int, int]:
+    """(expected output tokens, max_tokens to request) for a resume of resume_tokens."""
+    expected = int(OUTPUT_TOKENS_BASE + OUTPUT_TOKENS_PER_INPUT_TOKEN * resume_tokens)
+    max_tokens = min(MAX_OUTPUT_TOKENS, max(MIN_OUTPUT_TOKENS, int(expected * OUTPUT_TOKENS_MARGIN)))
+    return expected, max_tokens
+
+def build_messages(text: str, structure: str) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+    """Chat messages for parsing the (already slimmed) resume text, plus their token estimates."""
+    system_prompt = SYSTEM_PROMPT.format(structure=structure.strip())
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Resume text:\n\n{text}"}
+    ]
+    resume_tokens = estimate_tokens(text)
+    expected, max_tokens = output_token_budget(resume_tokens)
+    budget = {
+        "prefix_tokens": estimate_tokens(system_prompt),
+        "resume_tokens": resume_tokens,
+        "expected_output_tokens": expected,
+        "max_tokens": max_tokens
+    }
+    return messages, budget
+
+def estimate_directory(directory: str, input_price: float, output_price: float,
+                       output_tps: float, overhead: float) -> Dict[str, Any]:
+    """Token, cost and latency estimate for parsing every resume under directory, without calling the API."""
+    # Imported here: the parser imports this module
+    import deepseek_resume_parser as deepseek
+
+    files = []
+    for root, _, names in os.walk(directory):
+        files.extend(os.path.join(root, name) for name in sorted(names)
+                     if os.path.splitext(name)[1].lower() in ('.pdf', '.docx', '.doc', '.txt'))
+
+    totals = {"files": 0, "raw_resume_tokens": 0, "resume_tokens": 0, "prompt_tokens": 0,
+              "expected_output_tokens": 0, "max_tokens": 0, "cost_usd": 0.0, "latency_seconds": 0.0}
+    per_file = []
+    for path in files:
+        text = deepseek.read_resume_file(path)
+        if not text:
+            print(f"No text extracted from {path}, skipping", file=sys.stderr)
+            continue
+        raw_tokens = estimate_tokens(deepseek.clean_text(text, slim=False))
+        _, budget = build_messages(deepseek.clean_text(text), deepseek.SAMPLE_OUTPUT_STRUCTURE)
+        prompt_tokens = budget["prefix_tokens"] + budget["resume_tokens"]
+        cost = (prompt_tokens * input_price + budget["expected_output_tokens"] * output_price) / 1e6
+        latency = overhead + budget["expected_output_tokens"] / output_tps
+        per_file.append({"file": path, "raw_resume_tokens": raw_tokens, **budget,
+                         "cost_usd": round(cost, 6), "latency_seconds": round(latency, 1)})
+
+        totals["files"] += 1
+        totals["raw_resume_tokens"] += raw_tokens
+        totals["resume_tokens"] += budget["resume_tokens"]
+        totals["prompt_tokens"] += prompt_tokens
+        totals["expected_output_tokens"] += budget["expected_output_tokens"]
+        totals["max_tokens"] += budget["max_tokens"]
+        totals["cost_usd"] += cost
+        totals["latency_seconds"] += latency
+
+    totals["cost_usd"] = round(totals["cost_usd"], 4)
+    totals["latency_seconds"] = round(totals["latency_seconds"], 1)
+    if totals["raw_resume_tokens"]:
+        totals["slimming_saved_percent"] = round(
+            100 * (1 - totals["resume_tokens"] / totals["raw_resume_tokens"]), 1)
+    return {"files": per_file, "totals": totals}
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Estimate DeepSeek prompt tokens, cost and latency")
+    arg_parser.add_argument("--dry-run", metavar="DIR", required=True, help="Directory of resumes to estimate")
+    arg_parser.add_argument("--input-price", type=float, default=0.55, help="USD per million prompt tokens")
+    arg_parser.add_argument("--output-price", type=float, default=2.19, help="USD per million completion tokens")
+    arg_parser.add_argument("--output-tps", type=float, default=30.0, help="Completion tokens per second")
+    arg_parser.add_argument("--overhead", type=float, default=2.0, help="Seconds of queueing and prompt processing per call")
+    arg_parser.add_argument("--per-file", action="store_true", help="Include the estimate of every file")
+    args = arg_parser.parse_args()
+
+    report = estimate_directory(args.dry_run, args.input_price, args.output_price, args.output_tps, args.overhead)
+    if not args.per_file:
+        report.pop("files")
+    print(json.dumps(report, indent=2))
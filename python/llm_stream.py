@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Streaming (SSE) chat completions with incremental JSON parsing.
+
+Without streaming the DeepSeek path waits for the whole completion before it
+finds out the JSON was cut off. stream_chat_completion() requests
+`"stream": true` and feeds each content delta into IncrementalJsonParser,
+which reports every top-level field (name, contact_info, ...) as soon as its
+value is complete. The stream is abandoned early when:
+
+- the JSON object is complete (anything after it is commentary);
+- no tokens arrive for `stall_timeout` seconds once the first one did, or for
+  `first_token_timeout` seconds before it. Reasoning deltas (deepseek-r1's
+  "reasoning"/"reasoning_content") count as tokens, so a long thinking phase
+  is not mistaken for a stall;
+- no JSON object has started after PREAMBLE_LIMIT characters.
+
+The caller gets the content received so far plus flags saying whether it was
+truncated or stalled, and hands it to the usual repair and fallback logic.
+"""
+import sys
+import json
+import time
+from typing import Callable, Dict, List, Any, Optional
+
+import requests
+
+# Characters of non-JSON preamble tolerated before the generation is given up
+PREAMBLE_LIMIT = 2000
+# Minimum seconds between progress reports
+PROGRESS_INTERVAL = 1.0
+
+class IncrementalJsonParser:
+    """Tracks a JSON object as it streams in and reports each top-level member once complete."""
+
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None):
+        self.on_field = on_field
+        self.chars: List[str] = []
+        self.started = False
+        self.complete = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.member_start = 0
+        self.preamble = 0
+        self.fields: Dict[str, Any] = {}
+
+    def feed(self, chunk: str):
+        for ch in chunk:
+            if self.complete:
+                return
+            if not self.started:
+                # Skip code fences or other text before the object
+                if ch == '{':
+                    self.started = True
+                    self.depth = 1
+                    self.chars.append(ch)
+                    self.member_start = 1
+                else:
+                    self.preamble += 1
+                continue
+
+            self.chars.append(ch)
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in '{[':
+                self.depth += 1
+            elif ch in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    self._emit(len(self.chars) - 1)
+                    self.complete = True
+            elif ch == ',' and self.depth == 1:
+                self._emit(len(self.chars) - 1)
+                self.member_start = len(self.chars)
+
+    def _emit(self, end: int):
+        member = ''.join(self.chars[self.member_start:end]).strip()
+        if not member:
+            return
+        try:
+            value = json.loads('{' + member + '}')
+        except json.JSONDecodeError:
+            return
+        for key, item in value.items():
+            self.fields[key] = item
+            if self.on_field is not None:
+                self.on_field(key, item)
+
+    @property
+    def text(self) -> str:
+        """The JSON received so far, from the opening brace."""
+        return ''.join(self.chars)
+
+def stream_chat_completion(session, url: str, headers: Dict[str, str], payload: Dict[str, Any],
+                           connect_timeout: float, stall_timeout: float,
+                           first_token_timeout: Optional[float] = None,
+                           on_field: Optional[Callable[[str, Any], None]] = None,
+                           on_progress: Optional[Callable[[int, List[str]], None]] = None) -> Dict[str, Any]:
+    """POST a streamed chat completion and parse it incrementally.
+
+    Returns {"response", "content", "json", "fields", "complete", "truncated",
+    "stalled", "finish_reason"}; "json" is the content from the object's opening
+    brace on, without code fences. For non-200 answers only "response" is meaningful;
+    its body is read and the connection released.
+    """
+    result = {"response": None, "content": "", "json": "", "fields": {}, "complete": False,
+              "truncated": False, "stalled": False, "finish_reason": None}
+    first_token_timeout = max(stall_timeout, first_token_timeout or stall_timeout)
+    # The read timeout bounds the gap between bytes, so a silent connection counts as a stall;
+    # it has to allow the wait for the first token too
+    response = session.post(url, headers=headers, json=dict(payload, stream=True),
+                            stream=True, timeout=(connect_timeout, first_token_timeout))
+    result["response"] = response
+    if response.status_code != 200:
+        response.content  # load the error body for the caller before the connection goes back to the pool
+        response.close()
+        return result
+
+    parser = IncrementalJsonParser(on_field)
+    content = []
+    last_token_at = last_progress_at = time.monotonic()
+    token_seen = False
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            now = time.monotonic()
+            if now - last_token_at > (stall_timeout if token_seen else first_token_timeout):
+                # Keep-alive comments are arriving, but no tokens
+                result["stalled"] = True
+                break
+            # Blank lines separate events; lines starting with ':' are keep-alive comments
+            if not line or line.startswith(':') or not line.startswith('data:'):
+                continue
+            data = line[5:].strip()
+            if data == '[DONE]':
+                break
+            try:
+                event = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+
+            choice = (event.get("choices") or [{}])[0]
+            message = choice.get("delta") or {}
+            delta = message.get("content") or ""
+            if delta:
+                content.append(delta)
+                parser.feed(delta)
+            if delta or message.get("reasoning") or message.get("reasoning_content"):
+                last_token_at = now
+                token_seen = True
+            if choice.get("finish_reason"):
+                result["finish_reason"] = choice["finish_reason"]
+
+            if on_progress is not None and now - last_progress_at >= PROGRESS_INTERVAL:
+                on_progress(sum(len(piece) for piece in content), list(parser.fields))
+                last_progress_at = now
+            if parser.complete:
+                break
+            if not parser.started and parser.preamble > PREAMBLE_LIMIT:
+                print(f"No JSON after {parser.preamble} characters, abandoning the stream", file=sys.stderr)
+                break
+    except requests.exceptions.RequestException as e:
+        # A read timeout between bytes is a stall; anything else cut the stream short
+        result["stalled"] = isinstance(e, (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError))
+        print(f"Stream interrupted: {e}", file=sys.stderr)
+    finally:
+        response.close()
+
+    result["content"] = ''.join(content)
+    result["json"] = parser.text
+    result["fields"] = parser.fields
+    result["complete"] = parser.complete
+    # An object that was opened but never closed, whether by max_tokens, a stall or a dropped stream
+    result["truncated"] = parser.started and not parser.complete
+    return result
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenRouter chat completions API.
+
+Lets the DeepSeek parsing path be load-tested offline: point
+RESUME_PARSER_API_URL at this server (or run llm_benchmark.py, which starts
+one itself). Answers are either replayed from recorded responses (--replay,
+used in turn) or synthesized from the resume in the request, and faults can
+be injected at configurable rates:
+
+- latency before the first byte (--latency, plus up to --jitter) and a token
+  rate for streamed answers (--tokens-per-second);
+- 429s with a Retry-After header (--rate-429) and 500s (--rate-500);
+- JSON cut off as if max_tokens ran out (--rate-truncated);
+- malformed output: prose without JSON, broken JSON or an empty message
+  (--rate-malformed).
+
+Recordings are JSONL files (or directories of them) whose lines are either
+full chat completion responses or {"content": "..."} objects.
+
+Usage:
+    python mock_llm_server.py [--port 8790] [--replay recordings.jsonl] [--latency 2] [--rate-429 0.1]
+
+Endpoints:
+    POST /v1/chat/completions  (any path ending in /chat/completions; "stream": true answers with SSE)
+    GET  /metrics              request and fault counters
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8790
+
+# Characters per streamed delta, roughly one token
+STREAM_CHUNK_CHARS = 4
+
+MALFORMED_ANSWERS = [
+    "I'm sorry, but I can't parse this resume into the requested format.",
+    "{'name': 'Unknown', 'contact_info': {'email': ''}, 'education': [], }",
+    "",
+]
+
+def load_recordings(paths: List[str]) -> List[str]:
+    """Message contents from recorded responses in JSONL files or directories of them."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.jsonl'))
+        else:
+            files.append(path)
+
+    contents = []
+    for file_path in files:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "choices" in record:
+                    contents.append(record["choices"][0]["message"]["content"])
+                else:
+                    contents.append(record["content"])
+    return contents
+
+def synthesize_answer(messages: List[Dict[str, str]]) -> str:
+    """A well-formed parse of the resume in the last user message."""
+    text = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    text = re.sub(r'^\s*Resume text:\s*', '', text)
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    email = re.search(r'[\w.+-]+@[\w-]+\.[\w.-]+', text)
+    skills = sorted(set(re.findall(r'\b(Python|Java|JavaScript|Go|SQL|Docker|Kubernetes|AWS|Azure|React|Linux)\b', text)))
+    answer = {
+        "name": lines[0] if lines else "",
+        "contact_info": {"email": email.group(0) if email else "", "phone": "", "linkedin": "", "github": ""},
+        "education": [{"institution": "", "degree": "", "date": "", "description": ""}],
+        "experience": [{"company": "", "position": "", "date": "", "description": line} for line in lines[1:4]],
+        "skill": {"technical_skills": skills, "soft_skills": [], "tools": []}
+    }
+    return json.dumps(answer, indent=2)
+
+class MockLlm:
+    """Picks each answer and the fault to inject, and counts what was served."""
+
+    def __init__(self, recordings: Optional[List[str]] = None, latency: float = 0.0, jitter: float = 0.0,
+                 tokens_per_second: float = 0.0, rate_429: float = 0.0, retry_after: float = 1.0,
+                 rate_500: float = 0.0, rate_truncated: float = 0.0, rate_malformed: float = 0.0,
+                 seed: Optional[int] = None):
+        self.recordings = recordings or []
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rate_500 = rate_500
+        self.rate_truncated = rate_truncated
+        self.rate_malformed = rate_malformed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "streamed": 0, "ok": 0, "rate_limited": 0, "server_errors": 0,
+                         "truncated": 0, "malformed": 0}
+
+    def _count(self, name: str):
+        with self.lock:
+            self.counters[name] += 1
+
+    def choose(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Decide the outcome of one request: {"status", "content", "finish_reason", "delay"}."""
+        with self.lock:
+            self.counters["requests"] += 1
+            roll = self.random.random()
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            replayed = self.recordings[(self.counters["requests"] - 1) % len(self.recordings)] if self.recordings else None
+            cut = self.random.uniform(0.3, 0.9)
+            malformed = self.random.choice(MALFORMED_ANSWERS)
+
+        if roll < self.rate_429:
+            self._count("rate_limited")
+            return {"status": 429, "delay": 0.0}
+        roll -= self.rate_429
+        if roll < self.rate_500:
+            self._count("server_errors")
+            return {"status": 500, "delay": delay}
+        roll -= self.rate_500
+
+        content = replayed if replayed is not None else synthesize_answer(request.get("messages", []))
+        finish_reason = "stop"
+        if roll < self.rate_truncated:
+            self._count("truncated")
+            content = content[:int(len(content) * cut)]
+            finish_reason = "length"
+        elif roll < self.rate_truncated + self.rate_malformed:
+            self._count("malformed")
+            content = malformed
+        else:
+            self._count("ok")
+        return {"status": 200, "content": content, "finish_reason": finish_reason, "delay": delay}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.counters)
+
+def make_handler(mock: MockLlm):
+    """Build a request handler class bound to the given mock."""
+
+    class MockLlmHandler(BaseHTTPRequestHandler):
+        # Keep-alive, so the parser's pooled session behaves as against the real API
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _write_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        def _stream(self, model: str, content: str, finish_reason: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._write_chunk(b": MOCK PROCESSING\n\n")
+            pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+            for index, piece in enumerate(pieces + [""]):
+                last = index == len(pieces)
+                event = {"model": model, "choices": [{"index": 0, "delta": {"content": piece},
+                                                      "finish_reason": finish_reason if last else None}]}
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                if mock.tokens_per_second > 0 and not last:
+                    time.sleep(1 / mock.tokens_per_second)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._send_json(200, mock.metrics())
+            else:
+                self._send_json(404, {"error": {"message": "Not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length)
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "Not found"}})
+                return
+            try:
+                request = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                self._send_json(400, {"error": {"message": f"Invalid request body: {str(e)}"}})
+                return
+
+            outcome = mock.choose(request)
+            time.sleep(outcome["delay"])
+            if outcome["status"] == 429:
+                self._send_json(429, {"error": {"message": "Rate limit exceeded", "code": 429}},
+                                {"Retry-After": f"{mock.retry_after:g}"})
+                return
+            if outcome["status"] != 200:
+                self._send_json(outcome["status"], {"error": {"message": "Internal server error", "code": outcome["status"]}})
+                return
+
+            model = request.get("model", "mock")
+            if request.get("stream"):
+                mock._count("streamed")
+                try:
+                    self._stream(model, outcome["content"], outcome["finish_reason"])
+                except (BrokenPipeError, ConnectionResetError):
+                    # Clients stop reading once the JSON object is complete
+                    self.close_connection = True
+                return
+            if mock.tokens_per_second > 0:
+                time.sleep(len(outcome["content"]) / STREAM_CHUNK_CHARS / mock.tokens_per_second)
+            self._send_json(200, {
+                "id": f"mock-{int(time.time() * 1000)}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": outcome["content"]},
+                             "finish_reason": outcome["finish_reason"]}]
+            })
+
+        def log_message(self, format, *args):
+            # Keep stdout clean; access logs go to stderr
+            print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+
+    return MockLlmHandler
+
+def start_server(mock: MockLlm, host: str = DEFAULT_HOST, port: int = 0) -> ThreadingHTTPServer:
+    """Serve the mock from a background thread; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+def add_fault_arguments(arg_parser: argparse.ArgumentParser):
+    """Answer and fault options, shared with llm_benchmark.py."""
+    arg_parser.add_argument("--replay", nargs="+", metavar="JSONL", help="Recorded responses (files or directories)")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each answer")
+    arg_parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds")
+    arg_parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Answer generation speed (0 = instant)")
+    arg_parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    arg_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    arg_parser.add_argument("--rate-500", type=float, default=0.0, help="Fraction of requests answered with 500")
+    arg_parser.add_argument("--rate-truncated", type=float, default=0.0, help="Fraction of answers cut off mid-JSON")
+    arg_parser.add_argument("--rate-malformed", type=float, default=0.0, help="Fraction of answers that are not valid JSON")
+    arg_parser.add_argument("--seed", type=int, help="Random seed for reproducible fault sequences")
+
+def mock_from_arguments(args: argparse.Namespace) -> MockLlm:
+    return MockLlm(
+        recordings=load_recordings(args.replay) if args.replay else None,
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        rate_429=args.rate_429,
+        retry_after=args.retry_after,
+        rate_500=args.rate_500,
+        rate_truncated=args.rate_truncated,
+        rate_malformed=args.rate_malformed,
+        seed=args.seed
+    )
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve a local stand-in for the chat completions API")
+    arg_parser.add_argument("--host", default=DEFAULT_HOST)
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_fault_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    mock = mock_from_arguments(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(mock))
+    server.daemon_threads = True
+    print(f"Mock LLM listening on http://{args.host}:{args.port}/v1/chat/completions", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down mock LLM", file=sys.stderr)
+    finally:
+        server.server_close()
+        print(json.dumps(mock.metrics(), indent=2), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
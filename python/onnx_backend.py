@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""ONNX Runtime inference backend for the resume parser models.
+
+Selected with RESUME_PARSER_BACKEND=onnx. On first use each model is exported
+to ONNX once (from the local fp32 cache when present, otherwise from the
+HuggingFace hub) and saved as model_cache/<name>_onnx; later loads read the
+exported graph directly. Inference runs on ONNX Runtime's CPU execution
+provider through optimum's ORT model classes, which plug into the same
+transformers pipeline() and generate() calls the PyTorch path uses.
+
+Requires: pip install optimum[onnxruntime]
+
+Usage (pre-export both models, e.g. at deploy time):
+    python onnx_backend.py
+"""
+import os
+import sys
+import time
+from typing import Tuple, Any
+
+from inference_deadline import save_model_cache
+
+ONNX_MODEL_SUFFIX = "_onnx"
+ONNX_PROVIDER = os.environ.get("RESUME_PARSER_ONNX_PROVIDER", "CPUExecutionProvider")
+
+LOCAL_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
+
+# task -> (cache directory, HuggingFace name)
+ONNX_MODELS = {
+    "token-classification": ("ner_model", "dslim/bert-base-NER"),
+    "seq2seq": ("bart_model", "ml6team/bart-large-resume-parser"),
+}
+
+def _ort_model_class(task: str):
+    from optimum.onnxruntime import ORTModelForTokenClassification, ORTModelForSeq2SeqLM
+    return {
+        "token-classification": ORTModelForTokenClassification,
+        "seq2seq": ORTModelForSeq2SeqLM,
+    }[task]
+
+def load_onnx_model(task: str, local_model_dir: str = LOCAL_MODEL_DIR) -> Tuple[Any, Any]:
+    """Return (model, tokenizer) for the task, exporting to ONNX on first use."""
+    from transformers import AutoTokenizer
+
+    cache_name, model_name = ONNX_MODELS[task]
+    model_class = _ort_model_class(task)
+    onnx_path = os.path.join(local_model_dir, cache_name + ONNX_MODEL_SUFFIX)
+
+    if os.path.exists(onnx_path):
+        print(f"Loading ONNX model from local cache: {onnx_path}", file=sys.stderr)
+        model = model_class.from_pretrained(onnx_path, provider=ONNX_PROVIDER)
+        tokenizer = AutoTokenizer.from_pretrained(onnx_path)
+        return model, tokenizer
+
+    # Export from the fp32 cache if the PyTorch path already downloaded it
+    fp32_path = os.path.join(local_model_dir, cache_name)
+    source = fp32_path if os.path.exists(fp32_path) else model_name
+    print(f"Exporting {source} to ONNX (one-time)...", file=sys.stderr)
+    start_time = time.time()
+    model = model_class.from_pretrained(source, export=True, provider=ONNX_PROVIDER)
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    # Renamed into place once complete: a load past its deadline may be cut off mid-save
+    save_model_cache(onnx_path, model, tokenizer)
+    print(f"Exported ONNX model to {onnx_path} in {time.time() - start_time:.2f} seconds", file=sys.stderr)
+    return model, tokenizer
+
+if __name__ == "__main__":
+    os.makedirs(LOCAL_MODEL_DIR, exist_ok=True)
+    for task in ONNX_MODELS:
+        load_onnx_model(task)
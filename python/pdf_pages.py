@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Page-wise PDF text extraction shared by all parsers, with pluggable backends.
+
+Backends, fastest first:
+
+- "pdfium": pypdfium2's text pages (native PDFium, no layout analysis);
+- "pypdf2": PyPDF2's content stream text, with per-page fallbacks;
+- "pdfplumber": pdfminer layout analysis, the slowest but most robust on
+  multi-column and oddly encoded PDFs.
+
+Backends are generators over pages, so extract_pdf_pages(max_chars=...) stops
+reading a long document (a portfolio, a thesis) as soon as the calling
+engine's text budget is met: time and memory depend on the budget rather than
+on the file size.
+
+extract_pdf_pages() tries the installed backends in RESUME_PARSER_PDF_BACKENDS
+order (default "pdfium,pypdf2,pdfplumber") and escalates to the next one only
+when the text looks broken (see broken_text_reason()); if every backend's text
+looks broken, the one with the most readable text wins.
+
+pdfplumber's layout analysis is pure Python, so its pages are spread over
+forked worker processes rather than threads once a document has at least
+RESUME_PARSER_PDF_PARALLEL_PAGES pages (default 8). Each worker opens the PDF
+itself and extracts a contiguous range of pages; the ranges come back in
+order. RESUME_PARSER_PDF_WORKERS sets the pool size (default: CPU count, at
+most 4). Documents below the threshold, platforms without fork and processes
+that are already pool workers (batch mode) extract serially.
+
+In every backend a page that fails to extract becomes an empty page with a
+warning instead of failing the whole document. PyPDF2 parses the file once and
+falls back per page through PYPDF2_STRATEGIES.
+
+Usage (compare the backends on a directory of PDFs):
+    python pdf_pages.py --benchmark <dir> [--backends pdfium,pypdf2,pdfplumber]
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import importlib.util
+import multiprocessing
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+PDF_BACKEND_ORDER = [name.strip() for name in
+                     os.environ.get("RESUME_PARSER_PDF_BACKENDS", "pdfium,pypdf2,pdfplumber").split(",") if name.strip()]
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_PARSER_PDF_PARALLEL_PAGES", "8"))
+PDF_WORKERS = int(os.environ.get("RESUME_PARSER_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Page ranges per worker, so a slow range doesn't leave the other workers idle, and
+# pages per range at most, so extraction stopped at a text budget wastes little work
+RANGES_PER_WORKER = 2
+MAX_RANGE_PAGES = 4
+
+# Text quality thresholds below which the next backend is tried
+MIN_TEXT_CHARS = 50  # non-whitespace characters in the whole document
+MIN_LETTER_RATIO = 0.5  # letters among non-whitespace characters
+MAX_MEAN_WORD_LENGTH = 15  # longer means the backend lost the spaces between words
+MAX_ARTIFACT_RATIO = 0.02  # (cid:NN) placeholders and U+FFFD per non-whitespace character
+TEXT_ARTIFACT = re.compile(r'\(cid:\d+\)|\ufffd')
+
+def _extract_page(page, page_number: int) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception as e:
+        print(f"Warning: could not extract text from page {page_number}: {str(e)}", file=sys.stderr)
+        return ""
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of the PDF (runs in a worker process)."""
+    # Imported on use so the parsers can install pdfplumber before it is needed
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return [_extract_page(pdf.pages[index], index + 1) for index in range(start, stop)]
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    size = min(-(-page_count // parts), MAX_RANGE_PAGES)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+def _can_fork() -> bool:
+    # Daemonic pool workers (batch mode) are not allowed to start their own pools
+    return 'fork' in multiprocessing.get_all_start_methods() and not multiprocessing.current_process().daemon
+
+def iter_pdfplumber_pages(pdf_path: str) -> Iterator[str]:
+    """Text of each PDF page via pdfplumber, in page order."""
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        workers = min(PDF_WORKERS, page_count)
+        if page_count < PDF_PARALLEL_MIN_PAGES or workers < 2 or not _can_fork():
+            for index, page in enumerate(pdf.pages):
+                yield _extract_page(page, index + 1)
+            return
+
+    ranges = _page_ranges(page_count, workers * RANGES_PER_WORKER)
+    print(f"Extracting {page_count} PDF pages with {workers} workers", file=sys.stderr)
+    done = 0
+    try:
+        context = multiprocessing.get_context('fork')
+        # imap hands back the ranges in order as they finish; leaving early terminates the pool
+        with context.Pool(workers) as pool:
+            for pages in pool.imap(_extract_page_range_args, [(pdf_path, start, stop) for start, stop in ranges]):
+                for text in pages:
+                    done += 1
+                    yield text
+    except Exception as e:
+        print(f"Parallel PDF extraction failed ({str(e)}), extracting serially", file=sys.stderr)
+        for text in _extract_page_range(pdf_path, done, page_count):
+            yield text
+
+def _extract_page_range_args(args: Tuple[str, int, int]) -> List[str]:
+    return _extract_page_range(*args)
+
+def iter_pdfium_pages(pdf_path: str) -> Iterator[str]:
+    """Text of each PDF page via pypdfium2."""
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        for index in range(len(pdf)):
+            try:
+                page = pdf[index]
+                text_page = page.get_textpage()
+                text = text_page.get_text_range().replace('\r\n', '\n').replace('\r', '\n')
+                text_page.close()
+                page.close()
+            except Exception as e:
+                print(f"Warning: could not extract text from page {index + 1}: {str(e)}", file=sys.stderr)
+                text = ""
+            yield text
+    finally:
+        pdf.close()
+
+def _pypdf2_raw_text(page) -> str:
+    """Strings shown by the page's text operators, without layout or font decoding."""
+    from PyPDF2.generic import ContentStream
+
+    contents = page.get_contents()
+    if contents is None:
+        return ""
+    parts = []
+    for operands, operator in ContentStream(contents, page.pdf).operations:
+        if operator in (b"Tj", b"'", b'"'):
+            items = operands[-1:]
+        elif operator == b"TJ":
+            items = operands[0] if operands else []
+        elif operator in (b"T*", b"Td", b"TD", b"ET"):
+            parts.append("\n")
+            continue
+        else:
+            continue
+        for item in items:
+            if isinstance(item, str):
+                parts.append(item)
+            elif isinstance(item, bytes):
+                parts.append(item.decode('latin-1'))
+    return re.sub(r'\n\s*\n+', '\n', "".join(parts))
+
+# PyPDF2 strategies for one page, tried in order until one yields text
+PYPDF2_STRATEGIES = (
+    ("standard", lambda page: page.extract_text()),
+    # Upright text only: rotated runs with odd fonts make the full extraction fail
+    ("upright", lambda page: page.extract_text(orientations=0)),
+    ("raw", _pypdf2_raw_text),
+)
+
+def _pypdf2_page_text(page, page_number: int) -> str:
+    for name, strategy in PYPDF2_STRATEGIES:
+        try:
+            text = strategy(page) or ""
+        except Exception as e:
+            print(f"Warning: PyPDF2 {name} extraction failed on page {page_number}: {str(e)}", file=sys.stderr)
+            continue
+        if text.strip():
+            if name != "standard":
+                print(f"Page {page_number}: used PyPDF2 {name} extraction", file=sys.stderr)
+            return text
+    return ""
+
+def iter_pypdf2_pages(pdf_path: str) -> Iterator[str]:
+    """Text of each PDF page via PyPDF2, parsing the file once and falling back per page."""
+    from PyPDF2 import PdfReader
+
+    with open(pdf_path, 'rb') as file:
+        reader = PdfReader(file)
+        for index, page in enumerate(reader.pages):
+            yield _pypdf2_page_text(page, index + 1)
+
+# name -> (module that must be importable, page generator)
+PDF_BACKENDS: Dict[str, Tuple[str, Callable[[str], Iterator[str]]]] = {
+    "pdfium": ("pypdfium2", iter_pdfium_pages),
+    "pypdf2": ("PyPDF2", iter_pypdf2_pages),
+    "pdfplumber": ("pdfplumber", iter_pdfplumber_pages),
+}
+
+def available_backends(order: Optional[List[str]] = None) -> List[str]:
+    """Installed backends, in the configured order."""
+    return [name for name in (order or PDF_BACKEND_ORDER)
+            if name in PDF_BACKENDS and importlib.util.find_spec(PDF_BACKENDS[name][0]) is not None]
+
+def pdf_extractor_name() -> str:
+    """Text cache name for extract_pdf_pages() with the installed backends."""
+    return "pdf:" + ",".join(available_backends())
+
+def broken_text_reason(pages: List[str]) -> Optional[str]:
+    """Why the extracted text looks unusable, or None if it looks fine."""
+    text = "".join(pages)
+    chars = len(re.sub(r'\s', '', text))
+    if chars < MIN_TEXT_CHARS:
+        return f"only {chars} characters"
+    artifacts = len(TEXT_ARTIFACT.findall(text))
+    if artifacts / chars > MAX_ARTIFACT_RATIO:
+        return f"{artifacts} undecoded glyphs"
+    letters = sum(1 for c in text if c.isalpha())
+    if letters / chars < MIN_LETTER_RATIO:
+        return f"letter ratio {letters / chars:.2f}"
+    words = text.split()
+    mean_word_length = chars / len(words)
+    if mean_word_length > MAX_MEAN_WORD_LENGTH:
+        return f"mean word length {mean_word_length:.1f}"
+    return None
+
+def _readable_letters(pages: List[str]) -> int:
+    return sum(1 for c in TEXT_ARTIFACT.sub('', "".join(pages)) if c.isalpha())
+
+def take_pages(pages: Iterable[str], max_chars: Optional[int] = None) -> List[str]:
+    """Consume pages until their total length reaches max_chars (all of them without a budget)."""
+    taken = []
+    total = 0
+    iterator = iter(pages)
+    try:
+        for page in iterator:
+            taken.append(page)
+            total += len(page)
+            if max_chars is not None and total >= max_chars:
+                print(f"Text budget of {max_chars} characters reached after {len(taken)} pages, "
+                      "skipping the rest of the document", file=sys.stderr)
+                break
+    finally:
+        # Stop the generator now, closing its file and any worker pool
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+    return taken
+
+def extract_pdf_pages(pdf_path: str, backends: Optional[List[str]] = None,
+                      max_chars: Optional[int] = None) -> List[str]:
+    """Text of each PDF page from the fastest backend whose text doesn't look broken.
+
+    With max_chars, extraction stops after the page that brings the text to max_chars.
+    """
+    candidates = []
+    for name in backends or available_backends():
+        try:
+            pages = take_pages(PDF_BACKENDS[name][1](pdf_path), max_chars)
+        except Exception as e:
+            print(f"PDF backend {name} failed: {str(e)}", file=sys.stderr)
+            continue
+        reason = broken_text_reason(pages)
+        if reason is None:
+            return pages
+        print(f"PDF backend {name} text looks broken ({reason}), trying the next backend", file=sys.stderr)
+        candidates.append((_readable_letters(pages), pages))
+    if not candidates:
+        raise ValueError(f"No PDF backend could read {pdf_path}")
+    return max(candidates, key=lambda candidate: candidate[0])[1]
+
+def benchmark_backends(directory: str, backends: List[str]) -> Dict[str, Any]:
+    """Time each backend, and the escalation policy, on every PDF under directory."""
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith('.pdf'))
+
+    report = {"files": len(paths), "backends": {}}
+    for name in backends + ["auto"]:
+        stats = {"seconds": 0.0, "pages": 0, "chars": 0, "broken": 0, "failed": 0}
+        for path in paths:
+            start_time = time.time()
+            try:
+                pages = extract_pdf_pages(path, backends) if name == "auto" else list(PDF_BACKENDS[name][1](path))
+            except Exception as e:
+                print(f"{name} failed on {path}: {str(e)}", file=sys.stderr)
+                stats["failed"] += 1
+                continue
+            stats["seconds"] += time.time() - start_time
+            stats["pages"] += len(pages)
+            stats["chars"] += sum(len(page) for page in pages)
+            stats["broken"] += broken_text_reason(pages) is not None
+        stats["seconds"] = round(stats["seconds"], 3)
+        stats["pages_per_second"] = round(stats["pages"] / stats["seconds"], 1) if stats["seconds"] > 0 else 0.0
+        report["backends"][name] = stats
+    return report
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Compare the PDF text extraction backends")
+    arg_parser.add_argument("--benchmark", metavar="DIR", required=True, help="Directory of PDFs to extract")
+    arg_parser.add_argument("--backends", default=",".join(PDF_BACKEND_ORDER),
+                            help="Comma-separated backends, fastest first (default: RESUME_PARSER_PDF_BACKENDS)")
+    args = arg_parser.parse_args()
+
+    requested = [name.strip() for name in args.backends.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in PDF_BACKENDS]
+    if unknown:
+        arg_parser.error(f"Unknown backends: {', '.join(unknown)}")
+    installed = available_backends(requested)
+    for name in requested:
+        if name not in installed:
+            print(f"Skipping {name}: {PDF_BACKENDS[name][0]} is not installed", file=sys.stderr)
+    print(json.dumps(benchmark_backends(args.benchmark, installed), indent=2))
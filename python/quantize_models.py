@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Build int8 dynamically quantized copies of the cached resume parser models.
+
+Linear layers of the NER (BERT) and section extraction (BART) models are
+converted to int8 with torch dynamic quantization and saved next to the fp32
+cache as model_cache/ner_model_int8 and model_cache/bart_model_int8. A short
+accuracy/latency comparison against the fp32 models is written to
+model_cache/quantization_report.json.
+
+The parsers use the quantized copies when RESUME_PARSER_QUANTIZED=1.
+
+Usage:
+    python quantize_models.py [--samples resume1.pdf resume2.docx ...] [--skip-report]
+"""
+import os
+import sys
+import json
+import time
+import difflib
+import argparse
+from typing import Dict, List, Any
+
+import torch
+from transformers import (
+    AutoConfig,
+    AutoTokenizer,
+    AutoModelForTokenClassification,
+    AutoModelForSeq2SeqLM,
+    pipeline
+)
+
+# Define models
+NER_MODEL_NAME = "dslim/bert-base-NER"
+RESUME_PARSER_MODEL_NAME = "ml6team/bart-large-resume-parser"
+
+LOCAL_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
+QUANTIZED_STATE_FILE = "quantized_state_dict.pt"
+REPORT_FILE = os.path.join(LOCAL_MODEL_DIR, "quantization_report.json")
+
+# Used for the comparison report when no sample resumes are given
+SAMPLE_RESUME_TEXT = """John Doe
+john.doe@example.com | +1 (123) 456-7890 | San Francisco, CA
+
+EXPERIENCE
+Senior Software Engineer, Google, 2018 - Present
+Led a team of five engineers building data pipelines on Google Cloud.
+
+Software Engineer, Microsoft, 2015 - 2018
+Developed REST APIs in C# and Python for Azure services.
+
+EDUCATION
+MS Computer Science, Stanford University, 2013 - 2015
+BS Computer Science, University of California, Berkeley, 2009 - 2013
+
+SKILLS
+Python, Java, Kubernetes, Docker, AWS, SQL, Leadership, Communication
+"""
+
+# (cache directory, HuggingFace name, model class)
+MODELS = {
+    "ner": ("ner_model", NER_MODEL_NAME, AutoModelForTokenClassification),
+    "bart": ("bart_model", RESUME_PARSER_MODEL_NAME, AutoModelForSeq2SeqLM),
+}
+
+def quantize_dynamic(model):
+    """Convert the Linear layers of a model to int8 dynamic quantization."""
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_quantized_model(model_dir: str, model_class):
+    """Load a model saved by quantize_model_dir().
+
+    The architecture is rebuilt from the saved config, quantized the same way,
+    and then the int8 weights are loaded into it.
+    """
+    config = AutoConfig.from_pretrained(model_dir)
+    model = quantize_dynamic(model_class.from_config(config))
+    state_dict = torch.load(os.path.join(model_dir, QUANTIZED_STATE_FILE), map_location="cpu")
+    model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+def ensure_fp32_cache(cache_name: str, model_name: str, model_class) -> str:
+    """Make sure the fp32 model exists in the local cache, downloading it if needed."""
+    local_path = os.path.join(LOCAL_MODEL_DIR, cache_name)
+    if not os.path.exists(local_path):
+        print(f"Downloading {model_name} into {local_path}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = model_class.from_pretrained(model_name)
+        tokenizer.save_pretrained(local_path)
+        model.save_pretrained(local_path)
+    return local_path
+
+def quantize_model_dir(src_dir: str, dst_dir: str, model_class):
+    """Quantize the fp32 model in src_dir and persist the int8 copy in dst_dir."""
+    start_time = time.time()
+    tokenizer = AutoTokenizer.from_pretrained(src_dir)
+    model = model_class.from_pretrained(src_dir)
+    quantized = quantize_dynamic(model)
+
+    os.makedirs(dst_dir, exist_ok=True)
+    tokenizer.save_pretrained(dst_dir)
+    model.config.save_pretrained(dst_dir)
+    if getattr(model, "generation_config", None) is not None:
+        model.generation_config.save_pretrained(dst_dir)
+    torch.save(quantized.state_dict(), os.path.join(dst_dir, QUANTIZED_STATE_FILE))
+
+    print(f"Quantized {src_dir} -> {dst_dir} in {time.time() - start_time:.2f} seconds", file=sys.stderr)
+
+def dir_size_mb(path: str) -> float:
+    """Total size of the files in a directory, in megabytes."""
+    total = 0
+    for root, _, names in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in names)
+    return round(total / (1024 * 1024), 1)
+
+def load_sample_texts(sample_paths: List[str]) -> List[str]:
+    """Read sample resumes for the report, using the parser's text extraction."""
+    if not sample_paths:
+        return [SAMPLE_RESUME_TEXT]
+
+    import resume_parser_transformer
+    texts = []
+    for path in sample_paths:
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.pdf':
+            texts.append(resume_parser_transformer.extract_text_from_pdf(path))
+        elif ext in ['.docx', '.doc']:
+            texts.append(resume_parser_transformer.extract_text_from_docx(path))
+        else:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                texts.append(f.read())
+    return [text for text in texts if text.strip()]
+
+def _timed(fn, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start_time
+
+def compare_ner(fp32_dir: str, int8_dir: str, texts: List[str]) -> Dict[str, Any]:
+    """Compare entity output and latency of the fp32 and int8 NER models."""
+    tokenizer = AutoTokenizer.from_pretrained(fp32_dir)
+    fp32 = pipeline("ner", model=AutoModelForTokenClassification.from_pretrained(fp32_dir),
+                    tokenizer=tokenizer, aggregation_strategy="simple")
+    int8 = pipeline("ner", model=load_quantized_model(int8_dir, AutoModelForTokenClassification),
+                    tokenizer=tokenizer, aggregation_strategy="simple")
+
+    fp32_time = int8_time = 0.0
+    agreements = []
+    for text in texts:
+        fp32_entities, elapsed = _timed(fp32, text)
+        fp32_time += elapsed
+        int8_entities, elapsed = _timed(int8, text)
+        int8_time += elapsed
+
+        expected = {(e["entity_group"], e["word"]) for e in fp32_entities}
+        actual = {(e["entity_group"], e["word"]) for e in int8_entities}
+        union = expected | actual
+        agreements.append(len(expected & actual) / len(union) if union else 1.0)
+
+    return {
+        "fp32_ms_per_doc": round(fp32_time * 1000 / len(texts), 1),
+        "int8_ms_per_doc": round(int8_time * 1000 / len(texts), 1),
+        "speedup": round(fp32_time / int8_time, 2) if int8_time else None,
+        "entity_agreement": round(sum(agreements) / len(agreements), 3),
+        "fp32_size_mb": dir_size_mb(fp32_dir),
+        "int8_size_mb": dir_size_mb(int8_dir),
+    }
+
+def compare_bart(fp32_dir: str, int8_dir: str, texts: List[str]) -> Dict[str, Any]:
+    """Compare generated output and latency of the fp32 and int8 BART models."""
+    tokenizer = AutoTokenizer.from_pretrained(fp32_dir)
+    fp32 = AutoModelForSeq2SeqLM.from_pretrained(fp32_dir)
+    int8 = load_quantized_model(int8_dir, AutoModelForSeq2SeqLM)
+
+    fp32_time = int8_time = 0.0
+    similarities = []
+    exact = 0
+    for text in texts:
+        inputs = tokenizer(text, max_length=1024, truncation=True, return_tensors="pt")
+        with torch.no_grad():
+            fp32_out, elapsed = _timed(fp32.generate, inputs.input_ids, max_length=1000, early_stopping=True)
+            fp32_time += elapsed
+            int8_out, elapsed = _timed(int8.generate, inputs.input_ids, max_length=1000, early_stopping=True)
+            int8_time += elapsed
+
+        expected = tokenizer.decode(fp32_out[0], skip_special_tokens=True)
+        actual = tokenizer.decode(int8_out[0], skip_special_tokens=True)
+        exact += int(expected == actual)
+        similarities.append(difflib.SequenceMatcher(None, expected, actual).ratio())
+
+    return {
+        "fp32_ms_per_doc": round(fp32_time * 1000 / len(texts), 1),
+        "int8_ms_per_doc": round(int8_time * 1000 / len(texts), 1),
+        "speedup": round(fp32_time / int8_time, 2) if int8_time else None,
+        "exact_match_rate": round(exact / len(texts), 3),
+        "output_similarity": round(sum(similarities) / len(similarities), 3),
+        "fp32_size_mb": dir_size_mb(fp32_dir),
+        "int8_size_mb": dir_size_mb(int8_dir),
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Create int8 quantized copies of the cached parser models")
+    arg_parser.add_argument("--samples", nargs="*", default=[], help="Resume files used for the comparison report")
+    arg_parser.add_argument("--skip-report", action="store_true", help="Only quantize, don't compare")
+    args = arg_parser.parse_args()
+
+    os.makedirs(LOCAL_MODEL_DIR, exist_ok=True)
+    paths = {}
+    for key, (cache_name, model_name, model_class) in MODELS.items():
+        fp32_dir = ensure_fp32_cache(cache_name, model_name, model_class)
+        int8_dir = fp32_dir + "_int8"
+        quantize_model_dir(fp32_dir, int8_dir, model_class)
+        paths[key] = (fp32_dir, int8_dir)
+
+    if args.skip_report:
+        return
+
+    texts = load_sample_texts(args.samples)
+    report = {
+        "samples": len(texts),
+        "torch_threads": torch.get_num_threads(),
+        "ner": compare_ner(*paths["ner"], texts),
+        "bart": compare_bart(*paths["bart"], texts),
+    }
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(report, indent=2))
+    print(f"Report written to {REPORT_FILE}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Persistent parse result cache shared by the resume parsers.
+
+Results are keyed by the SHA-256 of the resume file's bytes plus the parser
+name and version, so re-uploads and retries of the same file are answered from
+disk instead of re-running the models or the API. The cache is a single SQLite
+database in WAL mode, so several parser processes can read it while another
+one writes. Entries expire after RESUME_PARSER_CACHE_TTL_DAYS, and the least
+recently used entries are evicted once the stored results exceed
+RESUME_PARSER_CACHE_MAX_MB.
+
+Set RESUME_PARSER_CACHE=0 to disable the cache.
+
+Usage (inspect or clear the cache):
+    python result_cache.py [--stats] [--clear]
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from typing import Dict, Any, Optional
+
+CACHE_ENABLED = os.environ.get("RESUME_PARSER_CACHE", "1").lower() not in ("0", "false", "no")
+CACHE_PATH = os.environ.get(
+    "RESUME_PARSER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "parse_cache", "results.sqlite3")
+)
+CACHE_MAX_BYTES = int(float(os.environ.get("RESUME_PARSER_CACHE_MAX_MB", "256")) * 1024 * 1024)
+CACHE_TTL_SECONDS = float(os.environ.get("RESUME_PARSER_CACHE_TTL_DAYS", "30")) * 24 * 3600
+
+# Seconds a reader or writer waits for a lock held by another process
+SQLITE_BUSY_TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    parser TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at);
+"""
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of the file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(file_path: str, parser: str, version: str) -> str:
+    """Cache key for a file parsed by a given parser name and version."""
+    return f"{parser}:{version}:{file_digest(file_path)}"
+
+def _connect(path: str = CACHE_PATH, schema: str = SCHEMA) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(schema)
+    return connection
+
+def get_cached(key: str, path: str = CACHE_PATH) -> Optional[str]:
+    """Return the cached value for key, or None on a miss, expiry or cache error."""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        connection = _connect(path)
+        try:
+            with connection:
+                row = connection.execute("SELECT value, created_at FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row[1] > CACHE_TTL_SECONDS:
+                    connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                    return None
+                connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+                return row[0]
+        finally:
+            connection.close()
+    # OSError: the cache directory cannot be created; parse without the cache
+    except (sqlite3.Error, OSError) as e:
+        print(f"Result cache read failed: {str(e)}", file=sys.stderr)
+        return None
+
+def store_cached(key: str, parser: str, value: str, path: str = CACHE_PATH):
+    """Store a value and evict expired and least recently used entries over the size limit."""
+    if not CACHE_ENABLED:
+        return
+    try:
+        connection = _connect(path)
+        try:
+            with connection:
+                now = time.time()
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (key, parser, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, parser, value, len(value.encode("utf-8")), now, now)
+                )
+                _evict(connection, now)
+        finally:
+            connection.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Result cache write failed: {str(e)}", file=sys.stderr)
+
+def _evict(connection: sqlite3.Connection, now: float, table: str = "results",
+           max_bytes: int = CACHE_MAX_BYTES, ttl_seconds: float = CACHE_TTL_SECONDS):
+    """Delete expired rows, then least recently used rows until the table fits max_bytes."""
+    connection.execute(f"DELETE FROM {table} WHERE created_at < ?", (now - ttl_seconds,))
+    total = connection.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+    if total <= max_bytes:
+        return
+    excess = total - max_bytes
+    doomed = []
+    for key, size in connection.execute(f"SELECT key, size FROM {table} ORDER BY accessed_at"):
+        if excess <= 0:
+            break
+        doomed.append((key,))
+        excess -= size
+    connection.executemany(f"DELETE FROM {table} WHERE key = ?", doomed)
+
+def get_cached_result(key: str) -> Optional[Dict[str, Any]]:
+    """Cached parse result dict for key, if any."""
+    value = get_cached(key)
+    if value is None:
+        return None
+    print("Returning cached parse result", file=sys.stderr)
+    return json.loads(value)
+
+def store_result(key: str, parser: str, result: Dict[str, Any]):
+    """Cache a parse result dict; failed parses are not cached."""
+    if result.get("success", False):
+        store_cached(key, parser, json.dumps(result, ensure_ascii=False))
+
+def cache_stats(path: str = CACHE_PATH) -> Dict[str, Any]:
+    """Number of entries and stored bytes per parser."""
+    connection = _connect(path)
+    try:
+        rows = connection.execute("SELECT parser, COUNT(*), SUM(size) FROM results GROUP BY parser").fetchall()
+    finally:
+        connection.close()
+    return {
+        "path": path,
+        "max_mb": round(CACHE_MAX_BYTES / (1024 * 1024), 1),
+        "ttl_days": round(CACHE_TTL_SECONDS / (24 * 3600), 1),
+        "parsers": {parser: {"entries": count, "size_kb": round(size / 1024, 1)} for parser, count, size in rows},
+    }
+
+def clear_cache(path: str = CACHE_PATH):
+    """Remove all cached results."""
+    connection = _connect(path)
+    try:
+        with connection:
+            connection.execute("DELETE FROM results")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Inspect or clear the parse result cache")
+    arg_parser.add_argument("--stats", action="store_true", help="Print entry counts and sizes (default)")
+    arg_parser.add_argument("--clear", action="store_true", help="Remove all cached results")
+    args = arg_parser.parse_args()
+
+    if args.clear:
+        clear_cache()
+        print(f"Cleared {CACHE_PATH}", file=sys.stderr)
+    print(json.dumps(cache_stats(), indent=2))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Thin client for resume_parser_server.py.
+
+Sends the file path to the running parser service and prints the JSON result
+to stdout, exactly like the parser scripts do. If the service is not running,
+the resume is parsed in-process so callers always get a result.
+
+Usage:
+    python resume_parser_client.py <resume_file_path> [--engine transformer|enhanced] [--lite] [--no-fallback]
+"""
+import os
+import sys
+import json
+import argparse
+import importlib
+import traceback
+import urllib.error
+import urllib.request
+from typing import Dict, Any
+
+from resume_parser_server import DEFAULT_HOST, DEFAULT_PORT, ENGINES
+
+# Generous timeout; model inference on CPU can take a while
+REQUEST_TIMEOUT = 300  # seconds
+
+def parse_with_service(file_path: str, host: str, port: int, lite: bool = False) -> Dict[str, Any]:
+    """Send a parse request to the resident parser service."""
+    body = json.dumps({"file_path": os.path.abspath(file_path), "lite": lite}).encode("utf-8")
+    request = urllib.request.Request(
+        f"http://{host}:{port}/parse",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        # The service answers errors with a JSON body as well
+        return json.loads(e.read().decode("utf-8"))
+
+def parse_in_process(file_path: str, engine_name: str, lite: bool = False) -> Dict[str, Any]:
+    """Parse the resume by loading the engine in this process."""
+    engine = importlib.import_module(ENGINES[engine_name])
+    return engine.parse_resume(file_path, lite)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parse a resume via the resident parser service")
+    arg_parser.add_argument("file_path")
+    arg_parser.add_argument("--engine", choices=sorted(ENGINES), default="transformer",
+                            help="Engine to use when falling back to in-process parsing")
+    arg_parser.add_argument("--host", default=DEFAULT_HOST)
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument("--lite", action="store_true",
+                            help="Quick regex-only parse without model inference")
+    arg_parser.add_argument("--no-fallback", action="store_true",
+                            help="Fail instead of parsing in-process when the service is down")
+    args = arg_parser.parse_args()
+
+    try:
+        try:
+            result = parse_with_service(args.file_path, args.host, args.port, args.lite)
+        except (urllib.error.URLError, ConnectionError) as e:
+            if args.no_fallback:
+                raise
+            print(f"Parser service unavailable ({e}), parsing in-process", file=sys.stderr)
+            result = parse_in_process(args.file_path, args.engine, True if args.lite else None)
+
+        print(json.dumps(result, ensure_ascii=False))
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+        print(json.dumps({"error": str(e), "success": False}))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
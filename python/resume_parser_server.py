@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Long-running resume parser service.
+
+Keeps the NER pipeline and the BART model resident in memory so each parse
+request only pays for text extraction and inference, instead of re-importing
+torch/transformers and reloading the models for every upload.
+
+Usage:
+    python resume_parser_server.py [--engine transformer|enhanced] [--host 127.0.0.1] [--port 8765]
+
+Endpoints:
+    POST /parse    {"file_path": "/abs/path/resume.pdf", "lite": false}  -> parser JSON result
+    GET  /health   service and model status
+    GET  /metrics  request and NER batching metrics
+
+With --concurrency above 1, NER calls from concurrent requests are collected
+for up to --ner-max-wait-ms (or until --ner-batch-size requests are pending)
+and run through the pipeline as one padded batch.
+"""
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import importlib
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any
+
+# Default bind address, shared with resume_parser_client.py
+DEFAULT_HOST = os.environ.get("RESUME_PARSER_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.environ.get("RESUME_PARSER_PORT", "8765"))
+
+# Parser modules that can be served
+ENGINES = {
+    "transformer": "resume_parser_transformer",
+    "enhanced": "enhanced_resume_parser",
+}
+
+def load_engine(engine_name: str):
+    """Import the parser module and load its models once."""
+    if engine_name not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine_name}")
+
+    # Make sibling parser modules importable regardless of the working directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    engine = importlib.import_module(ENGINES[engine_name])
+
+    start_time = time.time()
+    print(f"Preloading models for '{engine_name}' engine...", file=sys.stderr)
+    engine.load_ner_model()
+    engine.load_resume_parser_model()
+    print(f"Models loaded in {time.time() - start_time:.2f} seconds", file=sys.stderr)
+    return engine
+
+class NerMicroBatcher:
+    """Callable stand-in for the NER pipeline that batches concurrent calls.
+
+    Callers block in __call__ while a single scheduler thread collects pending
+    texts and runs them through the wrapped pipeline in one forward pass.
+    """
+
+    def __init__(self, ner_pipeline, max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        self.ner_pipeline = ner_pipeline
+        # Exposed so run_chunked_ner() can window texts before they are queued
+        self.tokenizer = getattr(ner_pipeline, "tokenizer", None)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.pending = queue.Queue()
+        self.stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.queue_seconds = 0.0
+        self.inference_seconds = 0.0
+
+        self.scheduler = threading.Thread(target=self._run, name="ner-micro-batcher", daemon=True)
+        self.scheduler.start()
+
+    def __call__(self, texts, **kwargs):
+        """Accept one text or a list of texts like the pipeline; batching kwargs are ignored."""
+        single = isinstance(texts, str)
+        requests = []
+        for text in ([texts] if single else texts):
+            request = {
+                "text": text,
+                "queued_at": time.monotonic(),
+                "done": threading.Event(),
+                "result": None,
+                "error": None,
+            }
+            self.pending.put(request)
+            requests.append(request)
+
+        results = []
+        for request in requests:
+            request["done"].wait()
+            if request["error"] is not None:
+                raise request["error"]
+            results.append(request["result"])
+        return results[0] if single else results
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        """Block for the first request, then gather more until the window closes or the batch is full."""
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            started_at = time.monotonic()
+            try:
+                # The pipeline pads the sequences of a batch to a common length
+                results = self.ner_pipeline([request["text"] for request in batch], batch_size=len(batch))
+                for request, result in zip(batch, results):
+                    request["result"] = result
+            except Exception as e:
+                print(f"Error in batched NER inference: {str(e)}", file=sys.stderr)
+                for request in batch:
+                    request["error"] = e
+            finished_at = time.monotonic()
+
+            with self.stats_lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.largest_batch = max(self.largest_batch, len(batch))
+                self.queue_seconds += sum(started_at - request["queued_at"] for request in batch)
+                self.inference_seconds += finished_at - started_at
+
+            for request in batch:
+                request["done"].set()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Report configuration and observed batching behaviour."""
+        with self.stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+                "batches": self.batches,
+                "requests": self.items,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "avg_queue_ms": round(self.queue_seconds * 1000 / self.items, 2) if self.items else 0.0,
+                "avg_batch_inference_ms": round(self.inference_seconds * 1000 / self.batches, 2) if self.batches else 0.0,
+            }
+
+class ResumeParserService:
+    """Holds the loaded engine and bounds concurrent access to it."""
+
+    def __init__(self, engine_name: str, concurrency: int = 1,
+                 ner_batch_size: int = 8, ner_max_wait_ms: float = 10.0):
+        self.engine_name = engine_name
+        self.engine = load_engine(engine_name)
+        self.ner_batcher = None
+        # Batching only pays off when several requests can be in flight;
+        # load_ner_model() hands the batcher to the engine from now on
+        if concurrency > 1 and ner_batch_size > 1 and self.engine.NER_PIPELINE is not None:
+            self.ner_batcher = NerMicroBatcher(self.engine.NER_PIPELINE, ner_batch_size, ner_max_wait_ms)
+            self.engine.NER_PIPELINE = self.ner_batcher
+        # Bound the number of parses running at once; models are shared
+        self.slots = threading.BoundedSemaphore(max(1, concurrency))
+        self.started_at = time.time()
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+
+    def parse(self, file_path: str, lite: bool = False) -> Dict[str, Any]:
+        """Parse a single resume with the resident models (regex-only when lite)."""
+        if not os.path.isfile(file_path):
+            return {
+                "success": False,
+                "error": "File not found",
+                "details": f"The file {file_path} does not exist."
+            }
+
+        with self.slots:
+            start_time = time.time()
+            result = self.engine.parse_resume(file_path, lite)
+            elapsed = time.time() - start_time
+
+        with self.stats_lock:
+            self.requests += 1
+            self.busy_seconds += elapsed
+            if not result.get("success", False):
+                self.failures += 1
+
+        print(f"Parsed {file_path} in {elapsed:.2f} seconds", file=sys.stderr)
+        return result
+
+    def health(self) -> Dict[str, Any]:
+        """Report service status and which models are resident."""
+        with self.stats_lock:
+            requests = self.requests
+            failures = self.failures
+            busy_seconds = self.busy_seconds
+
+        return {
+            "status": "ok",
+            "engine": self.engine_name,
+            "models": {
+                "ner": self.engine.NER_PIPELINE is not None,
+                "bart": self.engine.RESUME_MODEL is not None,
+            },
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": requests,
+            "failures": failures,
+            "avg_parse_seconds": round(busy_seconds / requests, 3) if requests else 0.0,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Report request counters together with NER batching metrics."""
+        metrics = self.health()
+        metrics["ner_batching"] = self.ner_batcher.metrics() if self.ner_batcher else None
+        return metrics
+
+def make_handler(service: ResumeParserService):
+    """Build a request handler class bound to the given service."""
+
+    class ResumeParserHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, service.health())
+            elif self.path == "/metrics":
+                self._send_json(200, service.metrics())
+            else:
+                self._send_json(404, {"success": False, "error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/parse":
+                self._send_json(404, {"success": False, "error": "Not found"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {"success": False, "error": f"Invalid request body: {str(e)}"})
+                return
+
+            file_path = str(request.get("file_path", "")).strip()
+            if not file_path:
+                self._send_json(400, {"success": False, "error": "No file path provided"})
+                return
+
+            try:
+                self._send_json(200, service.parse(file_path, bool(request.get("lite", False))))
+            except Exception as e:
+                print(f"Error serving parse request: {str(e)}", file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+                self._send_json(500, {"success": False, "error": f"Failed to parse resume: {str(e)}"})
+
+        def log_message(self, format, *args):
+            # Keep stdout clean; access logs go to stderr
+            print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+
+    return ResumeParserHandler
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve resume parsing with resident models")
+    arg_parser.add_argument("--engine", choices=sorted(ENGINES), default="transformer")
+    arg_parser.add_argument("--host", default=DEFAULT_HOST)
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument("--concurrency", type=int, default=1,
+                            help="Maximum number of parses running at the same time")
+    arg_parser.add_argument("--ner-batch-size", type=int, default=8,
+                            help="Maximum NER requests per batched forward pass (1 disables batching)")
+    arg_parser.add_argument("--ner-max-wait-ms", type=float, default=10.0,
+                            help="How long to wait for more NER requests before running a batch")
+    args = arg_parser.parse_args()
+
+    service = ResumeParserService(
+        args.engine,
+        concurrency=args.concurrency,
+        ner_batch_size=args.ner_batch_size,
+        ner_max_wait_ms=args.ner_max_wait_ms
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    server.daemon_threads = True
+    print(f"Resume parser service ({args.engine}) listening on http://{args.host}:{args.port}", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down resume parser service", file=sys.stderr)
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
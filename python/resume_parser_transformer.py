@@ -5,27 +5,60 @@ import json
 import re
 import traceback
 import time
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
+
+from inference_deadline import load_with_deadline, deadline_stopping_criteria, save_model_cache
+from chunked_ner import run_chunked_ner
+from section_chunks import split_for_context, merge_section_results
+from result_cache import cache_key, get_cached_result, store_result
+from text_cache import cached_pages
+from pdf_pages import extract_pdf_pages, pdf_extractor_name
+from docx_stream import read_docx_stream
 
 # Global variables to cache models
 NER_PIPELINE = None
 RESUME_MODEL = None
 RESUME_TOKENIZER = None
 MODEL_LOAD_TIMEOUT = 60  # seconds
+INFERENCE_TIMEOUT = 30  # seconds per resume
+# Resumes longer than one BART input are split into chunks of this many tokens
+# and the chunk outputs merged; RESUME_PARSER_MAP_REDUCE=0 truncates instead
+SECTION_CHUNK_TOKENS = 1000
+MAP_REDUCE_SECTIONS = os.environ.get("RESUME_PARSER_MAP_REDUCE", "1").lower() not in ("0", "false", "no")
+# PDF and DOCX extraction stop after the page or paragraph that reaches this many characters (about 10 dense pages)
+MAX_TEXT_CHARS = int(os.environ.get("RESUME_PARSER_MAX_TEXT_CHARS", "40000"))
 
 # Import necessary libraries
 try:
-    import torch
     import pdfplumber
     import docx
-    from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
 except ImportError:
     print("Installing required packages...", file=sys.stderr)
-    os.system("pip install torch transformers pdfplumber python-docx")
-    import torch
+    os.system("pip install pdfplumber python-docx")
     import pdfplumber
     import docx
-    from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
+
+# torch and transformers are imported on first use so the regex-only
+# stages (and --lite parses) start in milliseconds
+torch = None
+AutoTokenizer = AutoModelForTokenClassification = AutoModelForSeq2SeqLM = pipeline = None
+
+# Skip model-backed stages entirely (regex-only "lite" parsing)
+LITE_MODE = os.environ.get("RESUME_PARSER_LITE", "").lower() in ("1", "true", "yes")
+
+def import_model_libraries():
+    """Import torch and transformers on first use, installing them if missing."""
+    global torch, AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
+    if torch is not None:
+        return
+    try:
+        import torch
+        from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
+    except ImportError:
+        print("Installing required packages...", file=sys.stderr)
+        os.system("pip install torch transformers")
+        import torch
+        from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoModelForSeq2SeqLM, pipeline
 
 # Define models
 NER_MODEL_NAME = "dslim/bert-base-NER"
@@ -35,30 +68,64 @@ RESUME_PARSER_MODEL_NAME = "ml6team/bart-large-resume-parser"
 LOCAL_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
 os.makedirs(LOCAL_MODEL_DIR, exist_ok=True)
 
+# Use the int8 copies built by quantize_models.py when they exist
+USE_QUANTIZED_MODELS = os.environ.get("RESUME_PARSER_QUANTIZED", "").lower() in ("1", "true", "yes")
+QUANTIZED_MODEL_SUFFIX = "_int8"
+
+# Inference backend: "pytorch" (default) or "onnx" (ONNX Runtime, see onnx_backend.py)
+INFERENCE_BACKEND = os.environ.get("RESUME_PARSER_BACKEND", "pytorch").lower()
+
+# Bump when parsing logic changes so stale cached results are not served
+PARSER_VERSION = "4"
+
 def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from a PDF file using pdfplumber."""
-    text = ""
+    """Extract text from a PDF file with the fastest usable backend, reusing cached pages for a file seen before."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
-                text += "\n\n"
+        pages = cached_pages(pdf_path, pdf_extractor_name(),
+                             lambda path: extract_pdf_pages(path, max_chars=MAX_TEXT_CHARS), MAX_TEXT_CHARS)
     except Exception as e:
         print(f"Error extracting text from PDF: {str(e)}", file=sys.stderr)
         raise
-    return text
+    return "".join(page + "\n\n" for page in pages)
 
 def extract_text_from_docx(docx_path: str) -> str:
-    """Extract text from a DOCX file."""
-    text = ""
+    """Extract text from a DOCX file, reusing cached text for a file seen before."""
     try:
-        doc = docx.Document(docx_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        pages = cached_pages(docx_path, "docx-stream", read_docx_paragraphs, MAX_TEXT_CHARS)
     except Exception as e:
         print(f"Error extracting text from DOCX: {str(e)}", file=sys.stderr)
         raise
-    return text
+    return pages[0] if pages else ""
+
+def read_docx_paragraphs(docx_path: str) -> List[str]:
+    """Paragraphs, table rows, headers and footers of a DOCX file as a single page (DOCX has no page breaks to keep)."""
+    return [read_docx_stream(docx_path, max_chars=MAX_TEXT_CHARS)]
+
+def _load_ner_weights():
+    """Load the NER tokenizer and model weights from the configured source."""
+    import_model_libraries()
+    # Try to load from local cache if exists
+    local_ner_path = os.path.join(LOCAL_MODEL_DIR, "ner_model")
+    quantized_ner_path = local_ner_path + QUANTIZED_MODEL_SUFFIX
+    if INFERENCE_BACKEND == "onnx":
+        from onnx_backend import load_onnx_model
+        model, tokenizer = load_onnx_model("token-classification", LOCAL_MODEL_DIR)
+    elif USE_QUANTIZED_MODELS and os.path.exists(quantized_ner_path):
+        print(f"Loading int8 NER model from local cache: {quantized_ner_path}", file=sys.stderr)
+        from quantize_models import load_quantized_model
+        tokenizer = AutoTokenizer.from_pretrained(quantized_ner_path)
+        model = load_quantized_model(quantized_ner_path, AutoModelForTokenClassification)
+    elif os.path.exists(local_ner_path):
+        print(f"Loading NER model from local cache: {local_ner_path}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(local_ner_path)
+        model = AutoModelForTokenClassification.from_pretrained(local_ner_path)
+    else:
+        print(f"Loading NER model from HuggingFace: {NER_MODEL_NAME}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_NAME)
+        model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_NAME)
+        # Save to local cache, atomically: the load may be cut off once its deadline has passed
+        save_model_cache(local_ner_path, tokenizer, model)
+    return tokenizer, model
 
 def load_ner_model():
     """Load the NER model for entity extraction with timeout."""
@@ -67,24 +134,8 @@ def load_ner_model():
         return NER_PIPELINE
     
     try:
-        start_time = time.time()
-        # Try to load from local cache if exists
-        local_ner_path = os.path.join(LOCAL_MODEL_DIR, "ner_model")
-        if os.path.exists(local_ner_path):
-            print(f"Loading NER model from local cache: {local_ner_path}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(local_ner_path)
-            model = AutoModelForTokenClassification.from_pretrained(local_ner_path)
-        else:
-            print(f"Loading NER model from HuggingFace: {NER_MODEL_NAME}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_NAME)
-            model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_NAME)
-            # Save to local cache
-            tokenizer.save_pretrained(local_ner_path)
-            model.save_pretrained(local_ner_path)
-        
-        # Check for timeout
-        if time.time() - start_time > MODEL_LOAD_TIMEOUT:
-            raise TimeoutError(f"Loading NER model timed out after {MODEL_LOAD_TIMEOUT} seconds")
+        # Give up waiting once the load overruns; it finishes in the background
+        tokenizer, model = load_with_deadline("NER model", _load_ner_weights, MODEL_LOAD_TIMEOUT)
         
         NER_PIPELINE = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
         return NER_PIPELINE
@@ -95,6 +146,32 @@ def load_ner_model():
         NER_PIPELINE = None
         return None
 
+def _load_bart_weights():
+    """Load the BART tokenizer and model weights from the configured source."""
+    import_model_libraries()
+    # Try to load from local cache if exists
+    local_bart_path = os.path.join(LOCAL_MODEL_DIR, "bart_model")
+    quantized_bart_path = local_bart_path + QUANTIZED_MODEL_SUFFIX
+    if INFERENCE_BACKEND == "onnx":
+        from onnx_backend import load_onnx_model
+        model, tokenizer = load_onnx_model("seq2seq", LOCAL_MODEL_DIR)
+    elif USE_QUANTIZED_MODELS and os.path.exists(quantized_bart_path):
+        print(f"Loading int8 BART model from local cache: {quantized_bart_path}", file=sys.stderr)
+        from quantize_models import load_quantized_model
+        tokenizer = AutoTokenizer.from_pretrained(quantized_bart_path)
+        model = load_quantized_model(quantized_bart_path, AutoModelForSeq2SeqLM)
+    elif os.path.exists(local_bart_path):
+        print(f"Loading BART model from local cache: {local_bart_path}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(local_bart_path)
+        model = AutoModelForSeq2SeqLM.from_pretrained(local_bart_path)
+    else:
+        print(f"Loading BART model from HuggingFace: {RESUME_PARSER_MODEL_NAME}", file=sys.stderr)
+        tokenizer = AutoTokenizer.from_pretrained(RESUME_PARSER_MODEL_NAME)
+        model = AutoModelForSeq2SeqLM.from_pretrained(RESUME_PARSER_MODEL_NAME)
+        # Save to local cache, atomically: the load may be cut off once its deadline has passed
+        save_model_cache(local_bart_path, tokenizer, model)
+    return tokenizer, model
+
 def load_resume_parser_model():
     """Load the BART resume parser model with timeout."""
     global RESUME_MODEL, RESUME_TOKENIZER
@@ -102,24 +179,8 @@ def load_resume_parser_model():
         return RESUME_MODEL, RESUME_TOKENIZER
     
     try:
-        start_time = time.time()
-        # Try to load from local cache if exists
-        local_bart_path = os.path.join(LOCAL_MODEL_DIR, "bart_model")
-        if os.path.exists(local_bart_path):
-            print(f"Loading BART model from local cache: {local_bart_path}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(local_bart_path)
-            model = AutoModelForSeq2SeqLM.from_pretrained(local_bart_path)
-        else:
-            print(f"Loading BART model from HuggingFace: {RESUME_PARSER_MODEL_NAME}", file=sys.stderr)
-            tokenizer = AutoTokenizer.from_pretrained(RESUME_PARSER_MODEL_NAME)
-            model = AutoModelForSeq2SeqLM.from_pretrained(RESUME_PARSER_MODEL_NAME)
-            # Save to local cache
-            tokenizer.save_pretrained(local_bart_path)
-            model.save_pretrained(local_bart_path)
-        
-        # Check for timeout
-        if time.time() - start_time > MODEL_LOAD_TIMEOUT:
-            raise TimeoutError(f"Loading BART model timed out after {MODEL_LOAD_TIMEOUT} seconds")
+        # Give up waiting once the load overruns; it finishes in the background
+        tokenizer, model = load_with_deadline("BART model", _load_bart_weights, MODEL_LOAD_TIMEOUT)
         
         RESUME_MODEL = model
         RESUME_TOKENIZER = tokenizer
@@ -163,7 +224,8 @@ def extract_entities(text: str, ner_pipeline) -> Dict[str, Any]:
         }
     
     try:
-        results = ner_pipeline(text)
+        # Windowed so entities past the model's 512-token limit are not lost
+        results = run_chunked_ner(ner_pipeline, text)
         
         # Extract person names (assuming the first PER entity is the person's name)
         names = [entity["word"] for entity in results if entity["entity_group"] == "PER"]
@@ -410,9 +472,14 @@ def extract_resume_sections(text: str, model, tokenizer) -> Dict[str, Any]:
     if model is None or tokenizer is None:
         return extract_sections_fallback(text)
     
+    # Too long for one pass: generate per chunk and merge the results
+    if MAP_REDUCE_SECTIONS and count_tokens(text, tokenizer) > SECTION_CHUNK_TOKENS:
+        return extract_resume_sections_batch([text], model, tokenizer)[0]
+    
     try:
-        # Set a timeout for model inference
+        # Stop decoding once the inference budget is spent
         start_time = time.time()
+        stopping_criteria, deadline = deadline_stopping_criteria(start_time + INFERENCE_TIMEOUT)
         
         # Prepare input for the model
         inputs = tokenizer(text, max_length=1024, truncation=True, return_tensors="pt")
@@ -423,13 +490,13 @@ def extract_resume_sections(text: str, model, tokenizer) -> Dict[str, Any]:
                 outputs = model.generate(
                     inputs.input_ids,
                     max_length=1000,
-                    early_stopping=True
+                    early_stopping=True,
+                    stopping_criteria=stopping_criteria
                 )
                 
-                # Check for timeout
-                if time.time() - start_time > 30:  # 30-second timeout for inference
-                    print("Model inference timed out, using fallback", file=sys.stderr)
-                    return extract_sections_fallback(text)
+                # A cut-off output is usually still partly valid JSON
+                if deadline.timed_out:
+                    print("Model inference timed out, salvaging partial output", file=sys.stderr)
             except RuntimeError as e:
                 # Handle CUDA out of memory or other runtime errors
                 print(f"Runtime error in model.generate: {str(e)}", file=sys.stderr)
@@ -439,71 +506,148 @@ def extract_resume_sections(text: str, model, tokenizer) -> Dict[str, Any]:
         result = tokenizer.decode(outputs[0], skip_special_tokens=True)
         print(f"BART model raw output: {result[:100]}...", file=sys.stderr)
         
+        return sections_from_model_output(text, result)
+    except Exception as e:
+        print(f"Error in BART model processing: {str(e)}", file=sys.stderr)
+        return extract_sections_fallback(text)
+
+def extract_resume_sections_batch(texts: List[str], model, tokenizer, batch_size: int = 8) -> List[Dict[str, Any]]:
+    """Extract sections for many resumes, generating over batches of similar token length."""
+    # If model is not available, use fallback
+    if model is None or tokenizer is None:
+        return [extract_sections_fallback(text) for text in texts]
+    
+    # Long resumes contribute one chunk per context window, merged again at the end
+    owners, texts = split_long_resumes(texts, tokenizer)
+    
+    # Tokenize each resume exactly like the single-item path does
+    encodings = [tokenizer(text, max_length=1024, truncation=True)["input_ids"] for text in texts]
+    
+    # Sort by token length so each batch holds similarly sized inputs and padding stays small
+    order = sorted(range(len(texts)), key=lambda i: len(encodings[i]))
+    results = [None] * len(texts)
+    
+    for start in range(0, len(order), max(1, batch_size)):
+        group = order[start:start + batch_size]
         try:
-            # Try to parse the BART output as JSON
-            # First, check if it starts with a valid JSON character
-            if result.strip().startswith('{'):
-                result_dict = json.loads(result)
-            else:
-                # Try to find JSON in the string
-                json_start = result.find('{')
-                json_end = result.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    json_str = result[json_start:json_end]
-                    result_dict = json.loads(json_str)
-                else:
-                    raise json.JSONDecodeError("No JSON found in output", result, 0)
+            # Same per-resume inference budget as the single-item path
+            stopping_criteria, deadline = deadline_stopping_criteria(time.time() + INFERENCE_TIMEOUT * len(group))
+            padded = tokenizer.pad({"input_ids": [encodings[i] for i in group]}, return_tensors="pt")
+            with torch.no_grad():
+                outputs = model.generate(
+                    padded["input_ids"],
+                    attention_mask=padded["attention_mask"],
+                    max_length=1000,
+                    early_stopping=True,
+                    stopping_criteria=stopping_criteria
+                )
             
-            # Extract sections
-            education_text = result_dict.get("education", "")
-            experience_text = result_dict.get("experience", "")
-            skills_text = result_dict.get("skills", "")
+            if deadline.timed_out:
+                print("Batched model inference timed out, salvaging partial output", file=sys.stderr)
             
-            # If the model failed to extract proper JSON, try fallback parsing
-            if not isinstance(education_text, str) or not isinstance(experience_text, str) or not isinstance(skills_text, str):
-                # Fallback to regex-based section extraction
-                print("Invalid section data types, using fallback", file=sys.stderr)
-                return extract_sections_fallback(text)
+            decoded = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+            for i, result in zip(group, decoded):
+                results[i] = sections_from_model_output(texts[i], result)
+        except Exception as e:
+            print(f"Error in batched BART model processing: {str(e)}", file=sys.stderr)
+            for i in group:
+                results[i] = extract_sections_fallback(texts[i])
+    
+    return merge_chunk_results(owners, results)
+
+def count_tokens(text: str, tokenizer) -> int:
+    """Number of model input tokens in text, without special tokens."""
+    return len(tokenizer.encode(text, add_special_tokens=False))
+
+def split_long_resumes(texts: List[str], tokenizer) -> Tuple[List[List[int]], List[str]]:
+    """Split resumes that exceed SECTION_CHUNK_TOKENS at section boundaries.
+    
+    Returns the chunk indices belonging to each resume and the flat chunk list.
+    """
+    owners, chunks = [], []
+    for text in texts:
+        if MAP_REDUCE_SECTIONS:
+            pieces = split_for_context(text, lambda piece: count_tokens(piece, tokenizer), SECTION_CHUNK_TOKENS)
+        else:
+            pieces = [text]
+        if len(pieces) > 1:
+            print(f"Resume exceeds the model context, extracting sections from {len(pieces)} chunks", file=sys.stderr)
+        owners.append(list(range(len(chunks), len(chunks) + len(pieces))))
+        chunks.extend(pieces)
+    return owners, chunks
+
+def merge_chunk_results(owners: List[List[int]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge per-chunk section results back into one result per resume."""
+    return [results[indices[0]] if len(indices) == 1 else merge_section_results([results[i] for i in indices])
+            for indices in owners]
+
+def sections_from_model_output(text: str, result: str) -> Dict[str, Any]:
+    """Parse decoded BART output into structured sections, falling back to regex if it is unusable."""
+    try:
+        # Try to parse the BART output as JSON
+        # First, check if it starts with a valid JSON character
+        if result.strip().startswith('{'):
+            result_dict = json.loads(result)
+        else:
+            # Try to find JSON in the string
+            json_start = result.find('{')
+            json_end = result.rfind('}') + 1
+            if json_start >= 0 and json_end > json_start:
+                json_str = result[json_start:json_end]
+                result_dict = json.loads(json_str)
+            else:
+                raise json.JSONDecodeError("No JSON found in output", result, 0)
+        
+        # Extract sections
+        education_text = result_dict.get("education", "")
+        experience_text = result_dict.get("experience", "")
+        skills_text = result_dict.get("skills", "")
+        
+        # If the model failed to extract proper JSON, try fallback parsing
+        if not isinstance(education_text, str) or not isinstance(experience_text, str) or not isinstance(skills_text, str):
+            # Fallback to regex-based section extraction
+            print("Invalid section data types, using fallback", file=sys.stderr)
+            return extract_sections_fallback(text)
+        
+        # Parse structured data
+        education = parse_education(education_text)
+        experience = parse_experience(experience_text)
+        skills = parse_skills(skills_text)
+        
+        return {
+            "education": education,
+            "experience": experience,
+            "skills": skills
+        }
+    except json.JSONDecodeError as je:
+        print(f"JSON decode error: {str(je)}", file=sys.stderr)
+        # If JSON parsing fails, try to extract sections directly from output
+        try:
+            # Try to extract sections with regex from the raw output
+            education_match = re.search(r'"education"\s*:\s*"([^"]*)"', result)
+            experience_match = re.search(r'"experience"\s*:\s*"([^"]*)"', result)
+            skills_match = re.search(r'"skills"\s*:\s*"([^"]*)"', result)
+            
+            education_text = education_match.group(1) if education_match else ""
+            experience_text = experience_match.group(1) if experience_match else ""
+            skills_text = skills_match.group(1) if skills_match else ""
             
             # Parse structured data
             education = parse_education(education_text)
             experience = parse_experience(experience_text)
             skills = parse_skills(skills_text)
             
-            return {
-                "education": education,
-                "experience": experience,
-                "skills": skills
-            }
-        except json.JSONDecodeError as je:
-            print(f"JSON decode error: {str(je)}", file=sys.stderr)
-            # If JSON parsing fails, try to extract sections directly from output
-            try:
-                # Try to extract sections with regex from the raw output
-                education_match = re.search(r'"education"\s*:\s*"([^"]*)"', result)
-                experience_match = re.search(r'"experience"\s*:\s*"([^"]*)"', result)
-                skills_match = re.search(r'"skills"\s*:\s*"([^"]*)"', result)
-                
-                education_text = education_match.group(1) if education_match else ""
-                experience_text = experience_match.group(1) if experience_match else ""
-                skills_text = skills_match.group(1) if skills_match else ""
-                
-                # Parse structured data
-                education = parse_education(education_text)
-                experience = parse_experience(experience_text)
-                skills = parse_skills(skills_text)
-                
-                if education or experience or skills:
-                    return {
-                        "education": education,
-                        "experience": experience,
-                        "skills": skills
-                    }
-                else:
-                    return extract_sections_fallback(text)
-            except Exception as regex_err:
-                print(f"Regex extraction failed: {str(regex_err)}", file=sys.stderr)
+            if education or experience or skills:
+                return {
+                    "education": education,
+                    "experience": experience,
+                    "skills": skills
+                }
+            else:
                 return extract_sections_fallback(text)
+        except Exception as regex_err:
+            print(f"Regex extraction failed: {str(regex_err)}", file=sys.stderr)
+            return extract_sections_fallback(text)
     except Exception as e:
         print(f"Error in BART model processing: {str(e)}", file=sys.stderr)
         return extract_sections_fallback(text)
@@ -562,16 +706,37 @@ def extract_sections_fallback(text: str) -> Dict[str, Any]:
     return {
         "education": education,
         "experience": experience,
-        "skills": skills
+        "skills": skills,
+        # Regex stood in for the model; parse_resume neither caches nor hides that
+        "fallback": True
     }
 
-def parse_resume(file_path: str) -> Dict[str, Any]:
-    """Main function to parse resume from file path."""
+def result_cache_key(file_path: str, lite: bool) -> Tuple[str, str]:
+    """Result cache key and parser name for this file under the current model configuration."""
+    parser = "transformer-lite" if lite else "transformer"
+    version = f"{PARSER_VERSION}-{INFERENCE_BACKEND}-{'int8' if USE_QUANTIZED_MODELS else 'fp32'}"
+    return cache_key(file_path, parser, version), parser
+
+def parse_resume(file_path: str, lite: Optional[bool] = None) -> Dict[str, Any]:
+    """Main function to parse resume from file path.
+    
+    With lite=True (or RESUME_PARSER_LITE=1) only the regex stages run and
+    torch/transformers are never imported.
+    """
+    if lite is None:
+        lite = LITE_MODE
+    
     try:
-        # Extract text based on file type
         file_path = file_path.strip()
         file_ext = os.path.splitext(file_path)[1].lower()
         
+        # Same file parsed before by this parser: skip extraction and inference
+        key, parser = result_cache_key(file_path, lite)
+        cached = get_cached_result(key)
+        if cached is not None:
+            return cached
+        
+        # Extract text based on file type
         if file_ext == '.pdf':
             text = extract_text_from_pdf(file_path)
         elif file_ext in ['.docx', '.doc']:
@@ -582,16 +747,20 @@ def parse_resume(file_path: str) -> Dict[str, Any]:
         if not text:
             return {"error": "Could not extract text from file", "success": False}
         
-        start_time = time.time()
-        print("Loading models...", file=sys.stderr)
-        
-        # Load NER model for entity extraction with timeout protection
-        ner_pipeline = load_ner_model()
-        
-        # Load resume parser model with timeout protection
-        model, tokenizer = load_resume_parser_model()
-        
-        print(f"Models loaded in {time.time() - start_time:.2f} seconds", file=sys.stderr)
+        if lite:
+            print("Lite mode: using regex-based extraction only", file=sys.stderr)
+            ner_pipeline, model, tokenizer = None, None, None
+        else:
+            start_time = time.time()
+            print("Loading models...", file=sys.stderr)
+            
+            # Load NER model for entity extraction with timeout protection
+            ner_pipeline = load_ner_model()
+            
+            # Load resume parser model with timeout protection
+            model, tokenizer = load_resume_parser_model()
+            
+            print(f"Models loaded in {time.time() - start_time:.2f} seconds", file=sys.stderr)
         
         # Extract personal information (name, email, phone)
         print("Extracting personal information...", file=sys.stderr)
@@ -613,6 +782,12 @@ def parse_resume(file_path: str) -> Dict[str, Any]:
             "success": True
         }
         
+        # Outside lite mode the regex fallback means a model failed to load, timed out or gave unusable output:
+        # flag it, and keep it out of the cache so it is not served under the full-model key until the TTL runs out
+        if not lite and (sections.get("fallback") or ner_pipeline is None):
+            result["fallback"] = True
+        else:
+            store_result(key, parser, result)
         return result
     
     except Exception as e:
@@ -622,14 +797,15 @@ def parse_resume(file_path: str) -> Dict[str, Any]:
 
 if __name__ == "__main__":
     try:
-        if len(sys.argv) < 2:
+        args = [arg for arg in sys.argv[1:] if arg != "--lite"]
+        if not args:
             print(json.dumps({"error": "No file path provided", "success": False}))
             sys.exit(1)
         
-        file_path = sys.argv[1]
+        file_path = args[0]
         print(f"Parsing resume file: {file_path}", file=sys.stderr)
         
-        result = parse_resume(file_path)
+        result = parse_resume(file_path, lite=True if "--lite" in sys.argv[1:] else None)
         
         # Ensure clean JSON output
         json_output = json.dumps(result, ensure_ascii=False)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Map-reduce helpers for resumes longer than the BART context window.
+
+split_for_context() cuts a resume into chunks that each fit the model input,
+preferring section headings, then blank-line paragraphs, then single lines as
+cut points. A chunk that starts in the middle of a section repeats that
+section's heading so both the model and the regex fallback know what they are
+looking at. merge_section_results() folds the per-chunk section outputs back
+into a single education/experience/skills structure.
+"""
+import re
+import copy
+import json
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+# Short lines starting with a known section name, e.g. "WORK EXPERIENCE" or "Skills:"
+SECTION_HEADING = re.compile(
+    r'^\s*(?:professional\s+|work\s+|technical\s+|key\s+)?'
+    r'(?:education|academic|qualifications?|experience|employment|work history|skills|technologies|'
+    r'competencies|projects|certifications?|summary|profile|objective|achievements|publications)\b[^\n]{0,30}$',
+    re.IGNORECASE
+)
+
+def _blocks(text: str) -> List[Tuple[Optional[str], str]]:
+    """Split text into (section heading, block) pairs at headings and blank lines."""
+    blocks = []
+    heading = None
+    lines = []
+    for line in text.split('\n'):
+        is_heading = len(line.strip()) < 50 and SECTION_HEADING.match(line)
+        if is_heading or not line.strip():
+            if lines:
+                blocks.append((heading, '\n'.join(lines)))
+                lines = []
+            if is_heading:
+                heading = line.strip()
+                blocks.append((heading, heading))
+            continue
+        lines.append(line)
+    if lines:
+        blocks.append((heading, '\n'.join(lines)))
+    return blocks
+
+def split_for_context(text: str, count_tokens: Callable[[str], int], max_tokens: int) -> List[str]:
+    """Split text into chunks of at most max_tokens at section or paragraph boundaries."""
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for heading, block in _blocks(text):
+        # Paragraphs that are too long on their own are packed line by line
+        block_tokens = count_tokens(block)
+        pieces = [(block, block_tokens)] if block_tokens <= max_tokens else \
+            [(line, count_tokens(line)) for line in block.split('\n') if line.strip()]
+
+        for piece, piece_tokens in pieces:
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append('\n\n'.join(current))
+                current = []
+                current_tokens = 0
+            # Carry the section heading into chunks that start mid-section
+            if not current and heading is not None and piece != heading:
+                current.append(heading)
+                current_tokens += count_tokens(heading)
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+def _merge_values(merged: Any, value: Any) -> Any:
+    if merged is None:
+        return value
+    if isinstance(merged, list) and isinstance(value, list):
+        # Keep order, drop entries already produced by an earlier chunk
+        seen = {json.dumps(item, sort_keys=True) for item in merged}
+        for item in value:
+            key = json.dumps(item, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+        return merged
+    if isinstance(merged, dict) and isinstance(value, dict):
+        for key, item in value.items():
+            merged[key] = _merge_values(merged.get(key), item)
+        return merged
+    if isinstance(merged, str) and isinstance(value, str):
+        return _merge_text(merged, value)
+    return merged or value
+
+def _merge_text(merged: str, value: str) -> str:
+    """Append the paragraphs of value that merged does not already contain, one per line."""
+    lines = {line.strip() for line in merged.split('\n')}
+    for block in re.split(r'\n\s*\n', value):
+        block = block.strip()
+        if not block:
+            continue
+        # A single line must match a whole line; longer blocks must appear verbatim
+        if (block in lines) if '\n' not in block else (block in merged):
+            continue
+        merged = f"{merged}\n{block}" if merged.strip() else block
+        lines.update(line.strip() for line in block.split('\n'))
+    return merged
+
+def merge_section_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the section outputs of a resume's chunks into one result."""
+    merged = {}
+    for result in results:
+        for key, value in result.items():
+            merged[key] = _merge_values(merged.get(key), copy.deepcopy(value))
+    return merged
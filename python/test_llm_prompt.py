@@ -0,0 +1,31 @@
+from llm_prompt import slim_resume_text
+
+
+def test_date_only_lines_survive():
+    text = "EDUCATION\nB.Sc Computer Science\n2016/2020\nEXPERIENCE\nAcme Corp\n06/2021"
+    slimmed = slim_resume_text(text)
+    assert "2016/2020" in slimmed
+    assert "06/2021" in slimmed
+
+
+def test_number_only_lines_survive():
+    slimmed = slim_resume_text("Years of experience:\n10\nLanguages:\n3")
+    assert slimmed.split("\n") == ["Years of experience:", "10", "Languages:", "3"]
+
+
+def test_title_lines_survive():
+    slimmed = slim_resume_text("Resume\nJane Doe\nCV\nEngineer")
+    assert slimmed.split("\n") == ["Resume", "Jane Doe", "CV", "Engineer"]
+
+
+def test_pagination_lines_are_dropped():
+    text = "Jane Doe\nPage 1 of 2\nEngineer\n1 of 2\n- 2 -\nPage 2\nCurriculum Vitae"
+    assert slim_resume_text(text).split("\n") == ["Jane Doe", "Engineer"]
+
+
+def test_repeated_page_header_is_dropped():
+    header = "Jane Doe | jane@example.com | +1 555 0100"
+    text = f"{header}\n\nSKILLS\nPython\n\n{header}\n\nEXPERIENCE\nAcme Corp"
+    slimmed = slim_resume_text(text)
+    assert slimmed.count(header) == 1
+    assert "Acme Corp" in slimmed
@@ -0,0 +1,37 @@
+from section_chunks import merge_section_results, split_for_context
+
+
+def test_merges_string_sections_from_every_chunk():
+    merged = merge_section_results([
+        {"experience": "Acme 2019-2021 Engineer", "skills": "Python"},
+        {"experience": "Globex 2021-Present Senior Engineer", "skills": "Go, Kubernetes"},
+    ])
+    assert merged == {
+        "experience": "Acme 2019-2021 Engineer\nGlobex 2021-Present Senior Engineer",
+        "skills": "Python\nGo, Kubernetes",
+    }
+
+
+def test_string_merge_skips_repeated_blocks():
+    merged = merge_section_results([
+        {"experience": "WORK EXPERIENCE\n\nAcme 2019-2021\nEngineer"},
+        {"experience": "WORK EXPERIENCE\n\nAcme 2019-2021\nEngineer\n\nGlobex 2021-Present"},
+        {"experience": "", "education": "B.Sc Computer Science"},
+    ])
+    assert merged["experience"] == "WORK EXPERIENCE\n\nAcme 2019-2021\nEngineer\nGlobex 2021-Present"
+    assert merged["education"] == "B.Sc Computer Science"
+
+
+def test_list_sections_are_deduplicated():
+    merged = merge_section_results([
+        {"skills": ["Python", "SQL"]},
+        {"skills": ["SQL", "Docker"]},
+    ])
+    assert merged["skills"] == ["Python", "SQL", "Docker"]
+
+
+def test_split_for_context_carries_heading_into_later_chunks():
+    text = "EXPERIENCE\n" + "\n".join(f"Job {i} did things" for i in range(12))
+    chunks = split_for_context(text, lambda piece: len(piece.split()), 20)
+    assert len(chunks) > 1
+    assert all(chunk.startswith("EXPERIENCE") for chunk in chunks)
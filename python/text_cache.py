@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Persistent cache of extracted resume text, shared by all parser engines.
+
+Text extraction is deterministic and a large share of each parse, but it used
+to run again whenever a resume went through a different parser or was
+re-parsed after a rule change. Extracted pages are stored per file (SHA-256 of
+the bytes) and extractor name, so any engine using the same extractor reuses
+them: all parsers share the PDF entries of pdf_pages' backend chain and the
+"docx-stream" entries of docx_stream.
+
+The cache lives next to the result cache in its own SQLite database (WAL mode)
+with the same TTL and least-recently-used size eviction. Settings:
+RESUME_PARSER_TEXT_CACHE=0 disables it, RESUME_PARSER_TEXT_CACHE_MAX_MB
+(default 512) and RESUME_PARSER_TEXT_CACHE_TTL_DAYS (default 90).
+
+Usage (pre-extract every resume in a directory for the given engines):
+    python text_cache.py --warm <dir> [--engines transformer,deepseek] [--stats] [--clear]
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import importlib
+from typing import Callable, Dict, List, Any, Optional
+
+from result_cache import file_digest, _connect, _evict
+
+TEXT_CACHE_ENABLED = os.environ.get("RESUME_PARSER_TEXT_CACHE", "1").lower() not in ("0", "false", "no")
+TEXT_CACHE_PATH = os.environ.get(
+    "RESUME_PARSER_TEXT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "parse_cache", "texts.sqlite3")
+)
+TEXT_CACHE_MAX_BYTES = int(float(os.environ.get("RESUME_PARSER_TEXT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+TEXT_CACHE_TTL_SECONDS = float(os.environ.get("RESUME_PARSER_TEXT_CACHE_TTL_DAYS", "90")) * 24 * 3600
+
+TEXT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    key TEXT PRIMARY KEY,
+    extractor TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS texts_accessed_at ON texts (accessed_at);
+"""
+
+# engine -> (module, PDF extraction function, DOCX extraction function), used by --warm
+ENGINE_EXTRACTORS = {
+    "transformer": ("resume_parser_transformer", "extract_text_from_pdf", "extract_text_from_docx"),
+    "enhanced": ("enhanced_resume_parser", "extract_text_from_pdf", "extract_text_from_docx"),
+    "deepseek": ("deepseek_resume_parser", "extract_pdf_text", "extract_docx_text"),
+}
+
+def get_pages(file_path: str, extractor: str) -> Optional[List[str]]:
+    """Cached pages of file_path for the extractor, or None on a miss or cache error."""
+    if not TEXT_CACHE_ENABLED:
+        return None
+    key = f"{extractor}:{file_digest(file_path)}"
+    try:
+        connection = _connect(TEXT_CACHE_PATH, TEXT_SCHEMA)
+        try:
+            with connection:
+                row = connection.execute("SELECT value, created_at FROM texts WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row[1] > TEXT_CACHE_TTL_SECONDS:
+                    connection.execute("DELETE FROM texts WHERE key = ?", (key,))
+                    return None
+                connection.execute("UPDATE texts SET accessed_at = ? WHERE key = ?", (now, key))
+                return json.loads(row[0])
+        finally:
+            connection.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Text cache read failed: {str(e)}", file=sys.stderr)
+        return None
+
+def store_pages(file_path: str, extractor: str, pages: List[str]):
+    """Store the extracted pages of file_path and evict old entries."""
+    if not TEXT_CACHE_ENABLED:
+        return
+    key = f"{extractor}:{file_digest(file_path)}"
+    value = json.dumps(pages, ensure_ascii=False)
+    try:
+        connection = _connect(TEXT_CACHE_PATH, TEXT_SCHEMA)
+        try:
+            with connection:
+                now = time.time()
+                connection.execute(
+                    "INSERT OR REPLACE INTO texts (key, extractor, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, extractor, value, len(value.encode("utf-8")), now, now)
+                )
+                _evict(connection, now, "texts", TEXT_CACHE_MAX_BYTES, TEXT_CACHE_TTL_SECONDS)
+        finally:
+            connection.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Text cache write failed: {str(e)}", file=sys.stderr)
+
+def cached_pages(file_path: str, extractor: str, extract: Callable[[str], List[str]],
+                 max_chars: Optional[int] = None) -> List[str]:
+    """Return the pages of file_path, running extract(file_path) only on a cache miss.
+
+    Empty extractions are not cached so a better extractor gets another try.
+    With max_chars, extract is expected to stop once its pages reach max_chars
+    characters. Such an extraction may be incomplete, so it is stored under its
+    own key; a complete extraction cached earlier is cut to the same budget.
+    """
+    budget_extractor = f"{extractor}@{max_chars}"
+    pages = get_pages(file_path, extractor)
+    if pages is None and max_chars is not None:
+        pages = get_pages(file_path, budget_extractor)
+    if pages is not None:
+        print(f"Using cached {extractor} text for {os.path.basename(file_path)}", file=sys.stderr)
+        return _limit_pages(pages, max_chars)
+    pages = extract(file_path)
+    if any(page.strip() for page in pages):
+        truncated = max_chars is not None and sum(len(page) for page in pages) >= max_chars
+        store_pages(file_path, budget_extractor if truncated else extractor, pages)
+    return pages
+
+def _limit_pages(pages: List[str], max_chars: Optional[int]) -> List[str]:
+    """Leading pages up to and including the one that reaches max_chars."""
+    if max_chars is None:
+        return pages
+    total = 0
+    for index, page in enumerate(pages):
+        total += len(page)
+        if total >= max_chars:
+            return pages[:index + 1]
+    return pages
+
+def warm_directory(directory: str, engines: List[str]) -> Dict[str, Any]:
+    """Extract every PDF/DOCX under directory with each engine's extractors."""
+    # Make sibling parser modules importable regardless of the working directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in sorted(names)
+                     if os.path.splitext(name)[1].lower() in ('.pdf', '.docx', '.doc'))
+
+    summary = {"files": len(paths), "extracted": 0, "failed": 0}
+    start_time = time.time()
+    for engine_name in engines:
+        module_name, pdf_function, docx_function = ENGINE_EXTRACTORS[engine_name]
+        engine = importlib.import_module(module_name)
+        for path in paths:
+            is_pdf = path.lower().endswith('.pdf')
+            try:
+                getattr(engine, pdf_function if is_pdf else docx_function)(path)
+                summary["extracted"] += 1
+            except Exception as e:
+                print(f"Failed to extract {path} with {engine_name}: {str(e)}", file=sys.stderr)
+                summary["failed"] += 1
+    summary["seconds"] = round(time.time() - start_time, 2)
+    return summary
+
+def text_cache_stats() -> Dict[str, Any]:
+    """Number of entries and stored bytes per extractor."""
+    connection = _connect(TEXT_CACHE_PATH, TEXT_SCHEMA)
+    try:
+        rows = connection.execute("SELECT extractor, COUNT(*), SUM(size) FROM texts GROUP BY extractor").fetchall()
+    finally:
+        connection.close()
+    return {
+        "path": TEXT_CACHE_PATH,
+        "max_mb": round(TEXT_CACHE_MAX_BYTES / (1024 * 1024), 1),
+        "ttl_days": round(TEXT_CACHE_TTL_SECONDS / (24 * 3600), 1),
+        "extractors": {name: {"entries": count, "size_kb": round(size / 1024, 1)} for name, count, size in rows},
+    }
+
+def clear_text_cache():
+    """Remove all cached texts."""
+    connection = _connect(TEXT_CACHE_PATH, TEXT_SCHEMA)
+    try:
+        with connection:
+            connection.execute("DELETE FROM texts")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Warm, inspect or clear the extracted text cache")
+    arg_parser.add_argument("--warm", metavar="DIR", help="Extract every resume under DIR into the cache")
+    arg_parser.add_argument("--engines", default=",".join(ENGINE_EXTRACTORS),
+                            help="Comma-separated engines whose extractors to warm (default: all)")
+    arg_parser.add_argument("--stats", action="store_true", help="Print entry counts and sizes (default)")
+    arg_parser.add_argument("--clear", action="store_true", help="Remove all cached texts")
+    args = arg_parser.parse_args()
+
+    if args.clear:
+        clear_text_cache()
+        print(f"Cleared {TEXT_CACHE_PATH}", file=sys.stderr)
+    if args.warm:
+        engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+        unknown = [name for name in engines if name not in ENGINE_EXTRACTORS]
+        if unknown:
+            arg_parser.error(f"Unknown engines: {', '.join(unknown)}")
+        print(json.dumps(warm_directory(args.warm, engines), indent=2), file=sys.stderr)
+    print(json.dumps(text_cache_stats(), indent=2))
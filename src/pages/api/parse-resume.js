@@ -59,8 +59,9 @@ export default async function handler(req, res) {
       });
     }
     
-    // Set path to parser script
-    const parserScript = path.join(process.cwd(), 'python', 'resume_parser_transformer.py');
+    // Set path to parser script. The client forwards to the resident parser
+    // service (python/resume_parser_server.py) and parses in-process if it is down.
+    const parserScript = path.join(process.cwd(), 'python', 'resume_parser_client.py');
     console.log('Parser script path:', parserScript);
     
     // Check if parser script exists